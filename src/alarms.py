@@ -0,0 +1,88 @@
+import epoch
+
+MAX_ALARMS = 8
+_RECORD = 4  # bytes per alarm: hour, minute, weekday mask, flags
+
+# flags
+ALARM_ON = 1
+ONE_SHOT = 2  # turns itself off after ringing once
+GRADUAL = 4  # volume ramps up instead of starting at full
+
+# weekday masks, bit 0 = Sunday like utils.weekday
+EVERY_DAY = 0x7F
+WEEKDAYS = 0x3E
+WEEKENDS = 0x41
+
+
+def weekday(days: int) -> int:
+    # weekday of a day count since 1970-01-01, which was a Thursday
+    return (days + 4) % 7
+
+
+class AlarmSchedule:
+    """
+    Up to MAX_ALARMS weekly alarms packed into one bytearray
+    version is bumped on every change, so users know when to recompute
+    """
+
+    def __init__(self):
+        self.data = bytearray(MAX_ALARMS * _RECORD)
+        self.version = 0
+
+    def set(
+        self,
+        idx: int,
+        hour: int,
+        minute: int,
+        days: int = EVERY_DAY,
+        flags: int = ALARM_ON | GRADUAL,
+    ):
+        i = idx * _RECORD
+        self.data[i : i + _RECORD] = bytes((hour, minute, days, flags))
+        self.version += 1
+
+    def get(self, idx: int) -> tuple:
+        # (hour, minute, days, flags)
+        i = idx * _RECORD
+        return tuple(self.data[i : i + _RECORD])
+
+    def enable(self, idx: int, on: bool = True):
+        i = idx * _RECORD + 3
+        if on:
+            self.data[i] |= ALARM_ON
+        else:
+            self.data[i] &= ~ALARM_ON
+        self.version += 1
+
+    def is_on(self, idx: int) -> bool:
+        return bool(self.data[idx * _RECORD + 3] & ALARM_ON)
+
+    def flags(self, idx: int) -> int:
+        return self.data[idx * _RECORD + 3]
+
+    def next_fire(self, now: int) -> tuple:
+        """
+        now = epoch seconds
+        (epoch seconds, alarm index) of the first alarm strictly after now,
+        (-1, -1) if every alarm is off
+        """
+        data = self.data
+        day = now // epoch.SECONDS_PER_DAY
+        sod = now - day * epoch.SECONDS_PER_DAY
+        best = -1
+        best_idx = -1
+        for idx in range(MAX_ALARMS):
+            i = idx * _RECORD
+            if not data[i + 3] & ALARM_ON:
+                continue
+            t = epoch.seconds_of_day(data[i], data[i + 1])
+            days = data[i + 2]
+            # today if it's still ahead, otherwise up to a week from today
+            for d in range(0 if t > sod else 1, 8):
+                if days >> weekday(day + d) & 1:
+                    fire = (day + d) * epoch.SECONDS_PER_DAY + t
+                    if best < 0 or fire < best:
+                        best = fire
+                        best_idx = idx
+                    break
+        return best, best_idx
@@ -112,34 +112,58 @@ def check_brightness_value(value: int) -> None:
         raise ValueError("Brightness must be an int in the range: 0 - 15")
 
 
+class ShadowBits:
+    """
+    Like i2c_bits.RWBits, but backed by the shadow copy kept in AS1115_REG.
+    Reads come from RAM once the register is known, and writes that would
+    not change the register are skipped
+    """
+
+    def __init__(self, num_bits: int, register_address: int, lowest_bit: int = 0):
+        self.mask = ((1 << num_bits) - 1) << lowest_bit
+        self.register = register_address
+        self.lowest_bit = lowest_bit
+
+    def __get__(self, obj, objtype=None) -> int:
+        if obj is None:
+            return self
+        return (obj.read_shadow(self.register) & self.mask) >> self.lowest_bit
+
+    def __set__(self, obj, value: int) -> None:
+        reg = obj.read_shadow(self.register) & ~self.mask
+        obj.write_shadow(
+            self.register, reg | ((int(value) << self.lowest_bit) & self.mask)
+        )
+
+
 class AS1115_REG:
     # enables external clock
-    feature_clock_active = i2c_bit.RWBit(
-        register_address=AS1115_REGISTER["FEATURE"], bit=0
+    feature_clock_active = ShadowBits(
+        num_bits=1, register_address=AS1115_REGISTER["FEATURE"], lowest_bit=0
     )
     # resets all control registers except for feature register
-    feature_reset_all = i2c_bit.RWBit(
-        register_address=AS1115_REGISTER["FEATURE"], bit=1
+    feature_reset_all = ShadowBits(
+        num_bits=1, register_address=AS1115_REGISTER["FEATURE"], lowest_bit=1
     )
     # enable Code-B or HEX decoding for the selected digits
-    feature_decode_sel = i2c_bit.RWBit(
-        register_address=AS1115_REGISTER["FEATURE"], bit=2
+    feature_decode_sel = ShadowBits(
+        num_bits=1, register_address=AS1115_REGISTER["FEATURE"], lowest_bit=2
     )
     # enable blinking
-    feature_blink_enable = i2c_bit.RWBit(
-        register_address=AS1115_REGISTER["FEATURE"], bit=4
+    feature_blink_enable = ShadowBits(
+        num_bits=1, register_address=AS1115_REGISTER["FEATURE"], lowest_bit=4
     )
     # set blinking frequency
-    feature_blink_freq_sel = i2c_bit.RWBit(
-        register_address=AS1115_REGISTER["FEATURE"], bit=5
+    feature_blink_freq_sel = ShadowBits(
+        num_bits=1, register_address=AS1115_REGISTER["FEATURE"], lowest_bit=5
     )
     # sync blinking with LD/CS pin
-    feature_blink_sync = i2c_bit.RWBit(
-        register_address=AS1115_REGISTER["FEATURE"], bit=6
+    feature_blink_sync = ShadowBits(
+        num_bits=1, register_address=AS1115_REGISTER["FEATURE"], lowest_bit=6
     )
     # whether to start blinking w/ display turned on or off
-    feature_blink_start = i2c_bit.RWBit(
-        register_address=AS1115_REGISTER["FEATURE"], bit=7
+    feature_blink_start = ShadowBits(
+        num_bits=1, register_address=AS1115_REGISTER["FEATURE"], lowest_bit=7
     )
 
     #  Optical display test.
@@ -171,30 +195,30 @@ class AS1115_REG:
         register_address=AS1115_REGISTER["DISPLAY_TEST_MODE"], bit=6
     )
 
-    global_intensity = i2c_bits.RWBits(
+    global_intensity = ShadowBits(
         num_bits=4, register_address=AS1115_REGISTER["GLOBAL_INTENSITY"], lowest_bit=0
     )
-    intensity_01 = i2c_bits.RWBits(
+    intensity_01 = ShadowBits(
         num_bits=8, register_address=AS1115_REGISTER["DIG01_INTENSITY"], lowest_bit=0
     )
-    intensity_23 = i2c_bits.RWBits(
+    intensity_23 = ShadowBits(
         num_bits=8, register_address=AS1115_REGISTER["DIG23_INTENSITY"], lowest_bit=0
     )
 
-    scan_limit = i2c_bits.RWBits(
+    scan_limit = ShadowBits(
         num_bits=3, register_address=AS1115_REGISTER["SCAN_LIMIT"], lowest_bit=0
     )
-    decode_mode = i2c_bits.RWBits(
+    decode_mode = ShadowBits(
         num_bits=4, register_address=AS1115_REGISTER["DECODE_MODE"], lowest_bit=0
     )
-    self_addressing = i2c_bit.RWBit(
-        register_address=AS1115_REGISTER["SELF_ADDRESSING"], bit=0
+    self_addressing = ShadowBits(
+        num_bits=1, register_address=AS1115_REGISTER["SELF_ADDRESSING"], lowest_bit=0
     )
-    shutdown_mode_unchanged = i2c_bit.RWBit(
-        register_address=AS1115_REGISTER["SHUTDOWN"], bit=7
+    shutdown_mode_unchanged = ShadowBits(
+        num_bits=1, register_address=AS1115_REGISTER["SHUTDOWN"], lowest_bit=7
     )  # no reset
-    shutdown_mode_normal = i2c_bit.RWBit(
-        register_address=AS1115_REGISTER["SHUTDOWN"], bit=0
+    shutdown_mode_normal = ShadowBits(
+        num_bits=1, register_address=AS1115_REGISTER["SHUTDOWN"], lowest_bit=0
     )  # normal operation
 
     digit_0 = i2c_bits.RWBits(
@@ -210,12 +234,6 @@ class AS1115_REG:
         num_bits=4, register_address=AS1115_DIGIT_REGISTER[3], lowest_bit=0
     )
 
-    keyA = [None] * 8
-    # keyB = [None] * 8
-    for i in range(8):
-        keyA[i] = i2c_bit.ROBit(register_address=AS1115_REGISTER["KEY_A"], bit=i)
-        # keyB[i] = i2c_bit.ROBit(register_address=AS1115_REGISTER['KEY_B'], bit=i)
-
     led_diag = [[[None] for i in range(8)] for i in range(8)]
     for i in range(8):
         for j in range(8):
@@ -225,6 +243,58 @@ class AS1115_REG:
 
     def __init__(self, i2c: I2C, address: int = 0x00) -> None:
         self.i2c_device = i2c_device.I2CDevice(i2c, address)
+        self._block = bytearray(9)  # register address + up to 8 digits
+        self._byte = bytearray(1)
+        # shadow copy of the control registers, by address
+        self._shadow = bytearray(0x30)
+        self._shadow_valid = bytearray(0x30)
+        self.bus_reads = 0
+        self.bus_writes = 0
+        self.shadow_hits = 0  # reads answered from the shadow
+        self.shadow_skips = 0  # writes skipped because the shadow matched
+
+    def read_shadow(self, register: int) -> int:
+        if self._shadow_valid[register]:
+            self.shadow_hits += 1
+        else:
+            self.read_block(register, self._byte)
+            self._shadow[register] = self._byte[0]
+            self._shadow_valid[register] = 1
+        return self._shadow[register]
+
+    def write_shadow(self, register: int, value: int) -> None:
+        if self._shadow_valid[register] and self._shadow[register] == value:
+            self.shadow_skips += 1
+            return
+        self._byte[0] = value
+        self.write_block(register, self._byte)
+        self._shadow[register] = value
+        self._shadow_valid[register] = 1
+
+    def forget(self, register: int) -> None:
+        # the chip changed this register on its own, read it again next time
+        self._shadow_valid[register] = 0
+
+    def resync(self) -> None:
+        # drop the whole shadow, e.g. after the chip was reset
+        for i in range(len(self._shadow_valid)):
+            self._shadow_valid[i] = 0
+
+    def write_block(self, register: int, data) -> None:
+        # write consecutive registers in one auto-incremented transaction
+        self.bus_writes += 1
+        n = len(data)
+        self._block[0] = register
+        self._block[1 : n + 1] = data
+        with self.i2c_device as i2c:
+            i2c.write(self._block, end=n + 1)
+
+    def read_block(self, register: int, buffer: bytearray) -> None:
+        # read consecutive registers in one auto-incremented transaction
+        self.bus_reads += 1
+        self._block[0] = register
+        with self.i2c_device as i2c:
+            i2c.write_then_readinto(self._block, buffer, out_end=1)
 
     def set_digit(self, idx: int, value: int) -> None:
         if idx == 0:
@@ -252,11 +322,16 @@ class AS1115:
         self,
         i2c: I2C,
         address: int = 0x00,
+        auto_write: bool = True,
         brightness: int = 2,
         n_digits: int = 4,
     ) -> None:
         self.device = AS1115_REG(i2c, address)
         self.n_digits = n_digits
+        self.auto_write = auto_write
+        # digit framebuffer, and what the chip was last sent (0xFF = unknown)
+        self._digits = bytearray([AS1115_CLEAR] * n_digits)
+        self._digits_sent = bytearray([0xFF] * n_digits)
 
         # --- start writing to chip --- #
         if address != 0x00:
@@ -264,51 +339,96 @@ class AS1115:
 
         self._blink_rate = None
         self._brightness = None
-        self.keyscan = [None] * 8
+        self._keyscan = bytearray(2)  # KEY_A, KEY_B
+        self.keys = 0  # bitmask of held keys, KEY_A in bits 0-7, KEY_B in 8-15
+        self.keys_pressed = 0  # keys that went down since the previous scan
+        self.keys_released = 0  # keys that went up since the previous scan
 
+        self._configure()
+        self.blink_rate = 0
+        self.brightness = brightness
+
+    def _configure(self) -> None:
         self.device.decode_mode = 0xF  # this enables decoding on D0, D1, D2, D3
         self.device.feature_decode_sel = 0
         self.device.scan_limit = 6
         self.device.shutdown_mode_unchanged = 0
         self.device.shutdown_mode_normal = 1
+        # leaving shutdown with bit 7 clear resets the FEATURE register
+        self.device.forget(AS1115_REGISTER["FEATURE"])
+
+    def scan_keys(self) -> int:
+        # KEY_A and KEY_B in one read, keys are active low
+        self.device.read_block(AS1115_REGISTER["KEY_A"], self._keyscan)
+        keys = ~(self._keyscan[0] | (self._keyscan[1] << 8)) & 0xFFFF
+        changed = keys ^ self.keys
+        self.keys_pressed = changed & keys
+        self.keys_released = changed & self.keys
+        self.keys = keys
+        return keys
+
+    def show(self) -> None:
+        # send only the span of digits that changed since the last show
+        first = -1
+        for i in range(self.n_digits):
+            if self._digits[i] != self._digits_sent[i]:
+                if first < 0:
+                    first = i
+                last = i
+        if first < 0:
+            return  # unchanged frame, no bus traffic
+        span = memoryview(self._digits)[first : last + 1]
+        self.device.write_block(AS1115_DIGIT_REGISTER[first], span)
+        self._digits_sent[first : last + 1] = span
+
+    def resync(self) -> None:
+        # call after a chip reset, nothing cached about the chip is trusted
+        self.device.resync()
+        self._configure()
+        for i in range(self.n_digits):
+            self._digits_sent[i] = 0xFF
+        self.show()
+        self.blink_rate = self._blink_rate
+        self.brightness = self._brightness
 
-        self.blink_rate = 0
-        self.brightness = brightness
-
-    def scan_keys(self) -> list:
-        for i in range(8):
-            self.keyscan[i] = self.device.keyA[i].__get__(obj=self.device)
-        return [not x for x in self.keyscan]  # flip the bool values
+    def _auto_show(self) -> None:
+        if self.auto_write:
+            self.show()
 
     def clear(self) -> None:
-        n = self.n_digits
-        for i in range(n):
-            self.clear_idx(i)
+        for i in range(self.n_digits):
+            self._digits[i] = AS1115_CLEAR
+        self._auto_show()
 
     def clear_idx(self, idx: int) -> None:
-        self.device.set_digit(idx, AS1115_CLEAR)
+        self._digits[idx] = AS1115_CLEAR
+        self._auto_show()
 
     def display_idx(self, idx: int, value: int) -> None:
         # display int 0-9 on an individual digit
-        self.device.set_digit(idx, value)
+        self._digits[idx] = value
+        self._auto_show()
 
     def display_int(self, value: int) -> None:
         # display int on entire display
         value = int("{:04d}".format(value))
         for i in range(self.n_digits):
-            self.device.set_digit(i, reversed_nth(value, i, self.n_digits))
+            self._digits[i] = reversed_nth(value, i, self.n_digits)
+        self._auto_show()
 
     def display_half(self, value: int) -> None:
-        self.clear_idx(0)
-        self.clear_idx(1)
-        self.display_idx(2, nth(value, 1))
-        self.display_idx(3, nth(value, 0))
+        self._digits[0] = AS1115_CLEAR
+        self._digits[1] = AS1115_CLEAR
+        self._digits[2] = nth(value, 1)
+        self._digits[3] = nth(value, 0)
+        self._auto_show()
 
     def display_hourmin(self, hour: int, minute: int) -> None:
-        self.display_idx(0, nth(hour, 1))
-        self.display_idx(1, nth(hour, 0))
-        self.display_idx(2, nth(minute, 1))
-        self.display_idx(3, nth(minute, 0))
+        self._digits[0] = nth(hour, 1)
+        self._digits[1] = nth(hour, 0)
+        self._digits[2] = nth(minute, 1)
+        self._digits[3] = nth(minute, 0)
+        self._auto_show()
 
     def visualTest(self) -> None:
         self.device.disp_test_visual = 1
@@ -1,16 +1,92 @@
 import digitalio
 import analogio
+from array import array
 
-from utils import percentize
+from ring import RingStats
+
+# discharge curve, pin millivolts at 0, 10, ... 100 % charge, between the
+# old linear 1 V and 3 V end points but flat in the middle and steep at the
+# ends like a real cell
+SOC_MV = array("H", (1000, 1500, 1800, 2000, 2140, 2260, 2380, 2500, 2640, 2800, 3000))
+SOC_STEP = 10  # % between table entries
+
+# history, one entry per history_every samples
+HISTORY_SIZE = 240  # 24 h of 6 minute entries
+
+
+def mv_to_percent(mv: int) -> int:
+    # piecewise linear lookup in SOC_MV, clipped to 0 - 100
+    if mv <= SOC_MV[0]:
+        return 0
+    for i in range(1, len(SOC_MV)):
+        if mv < SOC_MV[i]:
+            lo = SOC_MV[i - 1]
+            return (i - 1) * SOC_STEP + (mv - lo) * SOC_STEP // (SOC_MV[i] - lo)
+    return 100
 
 
 class Batt:
-    def __init__(self, pin_vbatt, pin_usb):
-        self._v_batt_max = 3
-        self._v_batt_min = 1
+    """
+    Battery gauge
+    :param int oversample: ADC reads averaged per sample
+    :param int ema_shift: Smoothing, each sample moves the average by
+        1 / 2**ema_shift of the difference
+    :param int step: Reported percentages are multiples of this
+    :param int hysteresis: Extra percent the filtered value has to move past
+        halfway to the next step before the reported value changes
+    :param int history_every: Samples per history entry, like HTSensor
+    """
+
+    def __init__(
+        self,
+        pin_vbatt,
+        pin_usb,
+        oversample: int = 16,
+        ema_shift: int = 3,
+        step: int = 5,
+        hysteresis: int = 1,
+        history_every: int = 6,
+    ):
         self._v_batt = analogio.AnalogIn(pin_vbatt)
         self.usb_power = digitalio.DigitalInOut(pin_usb)
+        self.oversample = oversample
+        self.ema_shift = ema_shift
+        self.step = step
+        self.hysteresis = hysteresis
+        self.history_every = history_every
+        self._n_samples = 0
+        # filtered, unquantized percentages
+        self.history = RingStats(HISTORY_SIZE)
+        self._ema = self.read_mv() << ema_shift  # fixed point, seeded
+        self.percent = self._quantize(mv_to_percent(self._ema >> ema_shift))
+
+    def read_mv(self) -> int:
+        # one burst of reads, integer millivolts at the pin
+        total = 0
+        for _ in range(self.oversample):
+            total += self._v_batt.value
+        return total * 3300 // (65536 * self.oversample)
+
+    def _quantize(self, percent: int) -> int:
+        return (percent + self.step // 2) // self.step * self.step
+
+    def update(self) -> int:
+        # take a sample, returns the reported percentage
+        self._ema += self.read_mv() - (self._ema >> self.ema_shift)
+        raw = mv_to_percent(self._ema >> self.ema_shift)
+        # doubled so an odd step's halfway point isn't rounded down
+        if 2 * abs(raw - self.percent) > self.step + 2 * self.hysteresis:
+            self.percent = self._quantize(raw)
+        return self.percent
+
+    def sample(self) -> int:
+        # call once per sample period, every history_every'th goes in the history
+        percent = self.update()
+        if self._n_samples % self.history_every == 0:
+            self.history.push(mv_to_percent(self._ema >> self.ema_shift))
+        self._n_samples += 1
+        return percent
 
     def get_batt_frac(self) -> float:
-        volts = self._v_batt.value * 3.3 / 65536
-        return percentize(volts, min=self._v_batt_min, max=self._v_batt_max)
+        # only changes when the reported percentage does
+        return self.update() / 100
@@ -7,11 +7,20 @@ class PinButton:
     """
 
     def __init__(self, pin):
+        self.pin = pin
         self.button_prev = False
-        self.button = digitalio.DigitalInOut(pin)
+        self.claim()
+
+    def claim(self):
+        # take the pin, e.g. back from a sleep alarm
+        self.button = digitalio.DigitalInOut(self.pin)
         self.button.direction = digitalio.Direction.INPUT
         self.button.pull = digitalio.Pull.UP
 
+    def release(self):
+        # free the pin so it can be used as a sleep alarm
+        self.button.deinit()
+
     def update(self) -> bool:
         # this must run every timestep to work
         if self.button_prev is True and self._get_button() is False:
@@ -23,22 +32,3 @@ class PinButton:
 
     def _get_button(self) -> bool:
         return not self.button.value
-
-
-class ScanButton:
-    """
-    Debounces button presses from keyscan
-    """
-
-    def __init__(self):
-        self.button_prev = False
-        self.button = False
-
-    def update(self, input) -> bool:
-        # this must run every timestep to work
-        if self.button_prev is True and input is False:
-            # button was previously pressed, is no longer pressed
-            self.button_prev = False
-            return True
-        self.button_prev = input
-        return False
@@ -1,10 +1,15 @@
 import adafruit_ds3231
+import keypad
 import time
+from adafruit_register import i2c_bit
+from adafruit_register import i2c_bits
 
 # from ulab import numpy as np
-import adafruit_datetime
 from busio import I2C
 import utils
+import epoch
+import alarms
+from alarms import AlarmSchedule
 
 
 def get_suffix(n: int):
@@ -15,50 +20,244 @@ def get_suffix(n: int):
         return utils.number_suffix[last_digit]
 
 
+_SQW_SCAN_S = 0.02  # keypad scan interval of the square wave pin
+_SQW_SETTLE_S = 0.025  # one scan plus margin
+
+
+class _SquareWave:
+    """
+    DS3231 control register fields the driver doesn't expose
+    """
+
+    intcn = i2c_bit.RWBit(0x0E, 2)  # 1 = alarm interrupt, 0 = square wave
+    rate = i2c_bits.RWBits(2, 0x0E, 3)  # 0 = 1 Hz
+
+    def __init__(self, rtc: adafruit_ds3231.DS3231):
+        self.i2c_device = rtc.i2c_device
+
+
 class Clock:
-    def __init__(self, i2c: I2C):
+    """
+    DS3231 time and alarm
+    :param I2C i2c: The bus the DS3231 is on
+    :param sqw_pin: Optional pin wired to the DS3231 INT/SQW output. With it
+        the time is kept in RAM and advanced by the 1 Hz square wave, the RTC
+        is only read at boot, after setting the time and every resync_s
+    :param int resync_s: Seconds between reads of the RTC, aligned so
+        hourly resyncs land on the hour and one always lands on midnight
+    """
+
+    def __init__(self, i2c: I2C, sqw_pin=None, resync_s: int = 3600):
         self.rtc = adafruit_ds3231.DS3231(i2c)
-        self.alarm_enable = False
         self.alarm_delta_max = 10 * 60  # max alarm ring time, seconds
-        self.datetime_refresh = self.get_datetime_now()
+        self.i2c_count = 0  # RTC transactions since the last update()
+        # alarm 0 is the one the buttons edit, it starts off at the time
+        # left in the RTC like before
+        alarm_time, _ = self.rtc.alarm1
+        self.schedule = AlarmSchedule()
+        self.schedule.set(
+            0, alarm_time.tm_hour, alarm_time.tm_min, flags=alarms.GRADUAL
+        )
+        self.next_alarm = -1  # epoch seconds of the next fire, -1 if none
+        self.next_alarm_idx = -1
+        self.ringing_since = -1  # epoch seconds the ringing alarm fired at
+        self.ringing_idx = -1
+        # clock and schedule versions next_alarm was planned at
+        self._planned_version = -1
+        self._planned_schedule = -1
+        # bumped whenever the date or alarm settings change
+        self.version = 0
+        self._day = -1  # days since epoch of the snapshot
+        self._date_str = None
+        self._alarm_str = None
+        self.sqw = None
+        if sqw_pin is not None:
+            square_wave = _SquareWave(self.rtc)
+            square_wave.rate = 0
+            square_wave.intcn = False
+            # the seconds register updates on the falling edge, keypad scans
+            # the pin in the background and queues it as a press. countio
+            # would take PWM slice 1, which the piezo on GP2 needs
+            self.sqw = keypad.Keys(
+                (sqw_pin,), value_when_pressed=False, pull=True, interval=_SQW_SCAN_S
+            )
+            self._sqw_event = keypad.Event()
+        self._sqw_count = 0  # falling edges seen so far
+        self.resync_s = resync_s
+        self.resyncs = 0
+        self._sqw_seen = 0  # square wave edges already added to the time
+        self._resync_at = 0
+        self.resync()
+        self._plan()
 
-    def set_date(self, year: int, month: int, day: int):
-        year = utils.clip(year, 1970, 2037)  # duct-tape Y2038 problem
-        wday = utils.get_wday(year, month, day)
-        self.rtc.datetime = time.struct_time(
-            (
-                year,
-                month,
-                day,
-                self.rtc.datetime.tm_hour,
-                self.rtc.datetime.tm_min,
-                self.rtc.datetime.tm_sec,
-                wday,
-                -1,
-                -1,
+    def resync(self) -> None:
+        # read the RTC and line the edge count up with it
+        self.i2c_count = 0
+        self._set_now(self._read_datetime())
+        self._plan_resync()
+        self.resyncs += 1
+
+    def _plan_resync(self) -> None:
+        # the next resync_s boundary, only a read or write of the RTC moves it
+        self._resync_at = (self.epoch_now // self.resync_s + 1) * self.resync_s
+
+    def update(self) -> None:
+        # read the RTC once per tick, all getters use this snapshot
+        if self.sqw is None:
+            self.resync()
+        else:
+            # pure RAM unless a resync is due
+            self.i2c_count = 0
+            count = self._count_edges()
+            elapsed = count - self._sqw_seen
+            if elapsed:
+                self._sqw_seen = count
+                then = self.epoch_now
+                self._set_now(
+                    epoch.to_struct_time(then + elapsed), seconds=then + elapsed
+                )
+                if self.epoch_now >= self._resync_at:
+                    self.resync()
+        self._check_alarm()
+
+    def _check_alarm(self) -> None:
+        # the next fire time is precomputed, so a tick is one compare
+        if 0 <= self.next_alarm <= self.epoch_now:
+            self.ringing_since = self.next_alarm
+            self.ringing_idx = self.next_alarm_idx
+            if self.schedule.flags(self.ringing_idx) & alarms.ONE_SHOT:
+                self.schedule.enable(self.ringing_idx, False)
+            self._plan()
+        elif (
+            self._planned_version != self.version
+            or self._planned_schedule != self.schedule.version
+        ):
+            self._plan()
+
+    def _plan(self) -> None:
+        """
+        Find the next fire time and program it into the RTC, alarm1 gets
+        the next one and alarm2 the one after. Runs when the schedule or
+        the date changes, or after an alarm fires
+        """
+        fire, idx = self.schedule.next_fire(self.epoch_now)
+        if (fire, idx) != (self.next_alarm, self.next_alarm_idx):
+            self.next_alarm = fire
+            self.next_alarm_idx = idx
+            # the alarms are only a record in the RTC, ringing is decided by
+            # _check_alarm. With INTCN cleared for the square wave they
+            # can't reach INT either, so they aren't written at all
+            if fire >= 0 and self.sqw is None:
+                # monthly matches date, hour and minute, unique within a week
+                self.i2c_count += 1
+                self.rtc.alarm1 = (epoch.to_struct_time(fire), "monthly")
+                after, _ = self.schedule.next_fire(fire)
+                if after >= 0:
+                    self.i2c_count += 1
+                    self.rtc.alarm2 = (epoch.to_struct_time(after), "monthly")
+            self._bump_version()
+        self._planned_version = self.version
+        self._planned_schedule = self.schedule.version
+
+    def _set_now(self, t: time.struct_time, seconds: int = None) -> None:
+        self.now = t
+        self.epoch_now = epoch.to_epoch(t) if seconds is None else seconds
+        day = self.epoch_now // epoch.SECONDS_PER_DAY
+        if day != self._day:
+            # midnight rollover or a new date was set
+            self._day = day
+            self._bump_version()
+
+    def _bump_version(self) -> None:
+        self.version += 1
+        self._date_str = None
+        self._alarm_str = None
+
+    def _read_datetime(self) -> time.struct_time:
+        if self.sqw is None:
+            self.i2c_count += 1
+            return self.rtc.datetime
+        # an edge during the read would be counted on top of a time that
+        # already includes it, so read again if one came in. keypad reports
+        # an edge up to one scan later, so wait that long before checking
+        while True:
+            count = self._count_edges()
+            self.i2c_count += 1
+            t = self.rtc.datetime
+            time.sleep(_SQW_SETTLE_S)
+            if self._count_edges() == count:
+                self._sqw_seen = count
+                return t
+
+    def _count_edges(self) -> int:
+        # drain the keypad queue, one reused event so nothing is allocated
+        event = self._sqw_event
+        while self.sqw.events.get_into(event):
+            if event.pressed:
+                self._sqw_count += 1
+        return self._sqw_count
+
+    def _write_datetime(self, t: time.struct_time) -> None:
+        self.i2c_count += 1
+        self.rtc.datetime = t
+        if self.sqw is not None:
+            # writing the seconds restarts the DS3231's 1 Hz countdown, the
+            # next edge is a second away, so once keypad has reported an
+            # edge from before the write, none of the count is on top of t
+            time.sleep(_SQW_SETTLE_S)
+            self._sqw_seen = self._count_edges()
+        self._set_now(t)
+        self._plan_resync()
+        self._plan()  # the next fire time is absolute, it moves with the clock
+
+    def patch_datetime(
+        self,
+        year: int = None,
+        month: int = None,
+        day: int = None,
+        hour: int = None,
+        min: int = None,
+        sec: int = None,
+        wday: int = None,
+    ) -> None:
+        """
+        Read the RTC once, replace only the given fields, write it back once.
+        Every field comes from the same read, so a seconds rollover between
+        reads can't mix two different times.
+        """
+        t = self._read_datetime()
+        self._write_datetime(
+            time.struct_time(
+                (
+                    t.tm_year if year is None else year,
+                    t.tm_mon if month is None else month,
+                    t.tm_mday if day is None else day,
+                    t.tm_hour if hour is None else hour,
+                    t.tm_min if min is None else min,
+                    t.tm_sec if sec is None else sec,
+                    t.tm_wday if wday is None else wday,
+                    -1,
+                    -1,
+                )
             )
         )
-        # prevents premature refresh due to time confusion
-        self.datetime_refresh = self.get_datetime_now()
+
+    def set_date(self, year: int, month: int, day: int):
+        year = utils.clip(year, 1970, 2037)  # duct-tape Y2038 problem
+        wday = (epoch.days_from_civil(year, month, day) + 4) % 7  # Sunday = 0
+        self.patch_datetime(year=year, month=month, day=day, wday=wday)
 
     def set_time(self, hour: int, min: int):
-        self.rtc.datetime = time.struct_time(
-            (
-                self.rtc.datetime.tm_year,
-                self.rtc.datetime.tm_mon,
-                self.rtc.datetime.tm_mday,
-                hour,
-                min,
-                0,
-                self.rtc.datetime.tm_wday,
-                -1,
-                -1,
-            )
-        )
-        self.datetime_refresh = self.get_datetime_now()
+        self.patch_datetime(hour=hour, min=min, sec=0)
 
     def get_date_str(self) -> str:
-        current = self.rtc.datetime
+        # formatted once per day
+        if self._date_str is None:
+            self._date_str = self._format_date()
+        return self._date_str
+
+    def _format_date(self) -> str:
+        current = self.now
         weekday = utils.weekday[current.tm_wday]
         month = utils.month[current.tm_mon - 1]
         suffix = get_suffix(current.tm_mday)
@@ -68,105 +267,81 @@ class Clock:
         return date_str
 
     def get_time_str(self) -> str:
-        current = self.rtc.datetime
+        current = self.now
         return "{:d}:{:02d}".format(current.tm_hour, current.tm_min)
 
     def get_year(self) -> int:
-        return self.rtc.datetime.tm_year
+        return self.now.tm_year
 
     def get_month(self) -> int:
-        return self.rtc.datetime.tm_mon
+        return self.now.tm_mon
 
     def get_day(self) -> int:
-        return self.rtc.datetime.tm_mday
+        return self.now.tm_mday
 
     def get_hour(self) -> int:
-        return self.rtc.datetime.tm_hour
+        return self.now.tm_hour
 
     def get_min(self) -> int:
-        return self.rtc.datetime.tm_min
+        return self.now.tm_min
 
-    # alarm functions
+    # alarm functions, these act on alarm 0, the one the buttons edit
     def set_alarm(self, hour: int, min: int, enable=True):
-        self.rtc.alarm1 = (
-            time.struct_time(
-                (
-                    self.rtc.datetime.tm_year,
-                    self.rtc.datetime.tm_mon,
-                    self.rtc.datetime.tm_mday,
-                    hour,
-                    min,
-                    0,
-                    self.rtc.datetime.tm_wday,
-                    -1,
-                    -1,
-                )
-            ),
-            "daily",
-        )
-        self.alarm_enable = enable
+        _, _, days, flags = self.schedule.get(0)
+        flags = flags | alarms.ALARM_ON if enable else flags & ~alarms.ALARM_ON
+        self.schedule.set(0, hour, min, days=days, flags=flags)
+        self._plan()
 
-    def get_alarm_status(self, cancel: bool) -> bool:
+    def get_alarm_status(self) -> bool:
         """
         A large number of criteria must be reached for the alarm to
         really, truly be allowed to sound
         """
-        if self.alarm_enable and self.rtc.alarm1_status and not cancel:
-            alarm_delta = self.get_alarm_delta()
-            if 0 <= alarm_delta <= self.alarm_delta_max:
-                alarm_status = True
-            else:
-                self.reset_alarm()
-                alarm_status = False
-        else:
-            alarm_status = False
-        return alarm_status
+        if self.ringing_since < 0:
+            return False
+        if self.epoch_now - self.ringing_since > self.alarm_delta_max:
+            self.reset_alarm()
+            return False
+        return True
+
+    def is_gradual(self) -> bool:
+        # whether the ringing alarm ramps its volume up
+        return bool(self.schedule.flags(self.ringing_idx) & alarms.GRADUAL)
+
+    def ring(self, idx: int) -> None:
+        # make alarm idx ring from now, e.g. at the end of a snooze
+        self.ringing_since = self.epoch_now
+        self.ringing_idx = idx
 
     def reset_alarm(self) -> None:
-        self.rtc.alarm1_status = False
+        self.ringing_since = -1
+        self.ringing_idx = -1
 
     def disable_alarm(self) -> None:
-        self.alarm_enable = False
+        self.schedule.enable(0, False)
+        self._plan()
 
     def get_alarm_hour(self) -> int:
-        alarm_time, _ = self.rtc.alarm1
-        return alarm_time.tm_hour
+        return self.schedule.get(0)[0]
 
     def get_alarm_min(self) -> int:
-        alarm_time, _ = self.rtc.alarm1
-        return alarm_time.tm_min
+        return self.schedule.get(0)[1]
 
     def get_alarm_str(self) -> str:
-        if self.alarm_enable is True:
-            return "{:d}:{:02d}".format(self.get_alarm_hour(), self.get_alarm_min())
-        else:
-            return "None"
-
-    def get_datetime_alarm(self) -> adafruit_datetime.datetime:
-        # get time of next alarm
-        t = self.get_datetime_now()
-        return t.replace(
-            hour=self.get_alarm_hour(), minute=self.get_alarm_min(), second=0
-        )
-
-    def get_datetime_now(self) -> adafruit_datetime.datetime:
-        return adafruit_datetime.datetime.fromtimestamp(time.mktime(self.rtc.datetime))
-
-    def get_delta(self, t_then: adafruit_datetime.date) -> float:
-        # get difference between now and a specified time
-        # https://stackoverflow.com/questions/3096953/how-to-calculate-the-time-interval-between-two-time-strings
-        # if then is in the future, result is negative
-        # if then is in the past, result is positive
-        t_delta = self.get_datetime_now() - t_then
-        return t_delta.total_seconds()  # time delta in seconds
-
-    def get_alarm_delta(self) -> float:
-        # get time until next alarm
-        return self.get_delta(self.get_datetime_alarm())
+        # the next alarm of the whole schedule, formatted once per change
+        if self._alarm_str is None:
+            if self.next_alarm >= 0:
+                t = epoch.to_struct_time(self.next_alarm)
+                self._alarm_str = "{:d}:{:02d} {}".format(
+                    t.tm_hour, t.tm_min, utils.weekday[t.tm_wday]
+                )
+            else:
+                self._alarm_str = "None"
+        return self._alarm_str
 
-    def get_refresh_delta(self) -> float:
-        # get time since last refresh
-        return self.get_delta(self.datetime_refresh)
+    def get_epoch_now(self) -> int:
+        return self.epoch_now
 
-    def set_refresh(self):
-        self.datetime_refresh = self.get_datetime_now()
+    def get_epoch_alarm(self) -> int:
+        # time of the next alarm, -1 if none is on
+        return self.next_alarm
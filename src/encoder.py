@@ -8,8 +8,30 @@ class Encoder:
 
     def __init__(self, pinA, pinB):
         # encoder
+        self.pin = pinA  # wakes the board from sleep
+        self.pinB = pinB
         self.encoder = rotaryio.IncrementalEncoder(pinA, pinB)  # , divisor=2)
         self.zero_pos = self.encoder.position
+        self.last_pos = self.zero_pos
+
+    def claim(self):
+        # a new encoder counts from 0, move the references to match
+        self.encoder = rotaryio.IncrementalEncoder(self.pin, self.pinB)
+        self.zero_pos -= self._released_pos
+        self.last_pos -= self._released_pos
+
+    def release(self):
+        # free the pins so pin A can be used as a sleep alarm
+        self._released_pos = self.encoder.position
+        self.encoder.deinit()
+
+    def moved(self) -> bool:
+        # True if the encoder turned since the last call
+        pos = self.encoder.position
+        if pos == self.last_pos:
+            return False
+        self.last_pos = pos
+        return True
 
     def rezero(self):
         # re-zero encoder
@@ -0,0 +1,63 @@
+import time
+
+SECONDS_PER_DAY = 86400
+
+
+def days_from_civil(year: int, month: int, day: int) -> int:
+    # days since 1970-01-01 for a proleptic Gregorian date
+    # http://howardhinnant.github.io/date_algorithms.html#days_from_civil
+    if month <= 2:
+        year -= 1
+    era = year // 400
+    yoe = year - era * 400  # year of era, 0 - 399
+    mp = (month + 9) % 12  # March = 0
+    doy = (153 * mp + 2) // 5 + day - 1  # day of year, 0 - 365
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy  # day of era, 0 - 146096
+    return era * 146097 + doe - 719468
+
+
+def civil_from_days(days: int) -> tuple:
+    # (year, month, day) for days since 1970-01-01, inverse of days_from_civil
+    # http://howardhinnant.github.io/date_algorithms.html#civil_from_days
+    days += 719468
+    era = days // 146097
+    doe = days - era * 146097  # day of era, 0 - 146096
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365  # 0 - 399
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)  # day of year, 0 - 365
+    mp = (5 * doy + 2) // 153  # March = 0
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
+
+def seconds_of_day(hour: int, minute: int, second: int = 0) -> int:
+    return hour * 3600 + minute * 60 + second
+
+
+def to_epoch(t: time.struct_time) -> int:
+    # seconds since 1970-01-01, integer math only
+    days = days_from_civil(t.tm_year, t.tm_mon, t.tm_mday)
+    return days * SECONDS_PER_DAY + seconds_of_day(t.tm_hour, t.tm_min, t.tm_sec)
+
+
+def to_struct_time(seconds: int) -> time.struct_time:
+    """
+    Inverse of to_epoch, tm_wday counts from Sunday = 0 like utils.weekday
+    """
+    days = seconds // SECONDS_PER_DAY
+    sod = seconds - days * SECONDS_PER_DAY
+    year, month, day = civil_from_days(days)
+    return time.struct_time(
+        (
+            year,
+            month,
+            day,
+            sod // 3600,
+            sod // 60 % 60,
+            sod % 60,
+            (days + 4) % 7,  # 1970-01-01 was a Thursday
+            days - days_from_civil(year, 1, 1) + 1,
+            -1,
+        )
+    )
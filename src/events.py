@@ -0,0 +1,108 @@
+from array import array
+
+import utils
+
+EVENT_NONE = 0  # returned by an empty queue, real event IDs start at 1
+
+# KeyEvents keymap flags
+ON_RELEASE = 1  # send the event when the key goes up instead of down
+REPEAT = 2  # keep sending the event while the key is held past long_ms
+
+
+class EventQueue:
+    """
+    Bounded ring buffer of (event, ticks_ms) records, read oldest first.
+    When full, the oldest record is dropped
+    """
+
+    def __init__(self, size: int = 16):
+        self.size = size
+        self._event = bytearray(size)
+        self._t_ms = array("L", [0] * size)
+        self._head = 0  # index of the oldest record
+        self._len = 0
+        self.dropped = 0  # records lost to a full queue
+        self.t_ms = 0  # timestamp of the record get() returned last
+
+    def put(self, event: int, t_ms: int) -> None:
+        if self._len == self.size:
+            self._head = (self._head + 1) % self.size
+            self._len -= 1
+            self.dropped += 1
+        idx = (self._head + self._len) % self.size
+        self._event[idx] = event
+        self._t_ms[idx] = t_ms
+        self._len += 1
+
+    def get(self) -> int:
+        # oldest event, its timestamp goes to self.t_ms
+        if self._len == 0:
+            return EVENT_NONE
+        idx = self._head
+        self._head = (self._head + 1) % self.size
+        self._len -= 1
+        self.t_ms = self._t_ms[idx]
+        return self._event[idx]
+
+    def __len__(self) -> int:
+        return self._len
+
+
+class KeyEvents:
+    """
+    Turns keyscan edges into queued events, with long press and auto repeat
+    :param EventQueue queue: Where the events go
+    :param keymap: Tuple of (key bitmask, event, long press event, flags),
+        a long press event of EVENT_NONE disables long press for that key
+    :param int long_ms: How long a key is held before it counts as a long press
+    :param int repeat_ms: Auto repeat period after a long press
+    """
+
+    def __init__(
+        self,
+        queue: EventQueue,
+        keymap: tuple,
+        long_ms: int = 1000,
+        repeat_ms: int = 250,
+    ):
+        self.queue = queue
+        self.keymap = keymap
+        self.long_ms = long_ms
+        self.repeat_ms = repeat_ms
+        n = len(keymap)
+        self._held = bytearray(n)  # 0 up, 1 held, 2 repeating, 3 long press done
+        self._due_ms = array("L", [0] * n)  # next long press or repeat
+
+    def update(self, pressed: int, released: int, t_ms: int) -> None:
+        # feed the edges of one keyscan
+        for i in range(len(self.keymap)):
+            key, event, _, flags = self.keymap[i]
+            if pressed & key:
+                self._held[i] = 1
+                self._due_ms[i] = utils.ticks_add(t_ms, self.long_ms)
+                if not flags & ON_RELEASE:
+                    self.queue.put(event, t_ms)
+            if released & key:
+                # a long press already sent its own event
+                if flags & ON_RELEASE and self._held[i] == 1:
+                    self.queue.put(event, t_ms)
+                self._held[i] = 0
+
+    def tick(self, t_ms: int) -> None:
+        # call regularly, sends long presses and repeats for held keys
+        for i in range(len(self.keymap)):
+            held = self._held[i]
+            if held == 0 or held == 3 or utils.ticks_diff(t_ms, self._due_ms[i]) < 0:
+                continue
+            _, event, long_event, flags = self.keymap[i]
+            if long_event == EVENT_NONE and not flags & REPEAT:
+                # nothing to send while held, a release event stays due
+                continue
+            if held == 1 and long_event != EVENT_NONE:
+                self.queue.put(long_event, t_ms)
+            if flags & REPEAT:
+                self.queue.put(event, t_ms)
+                self._held[i] = 2
+                self._due_ms[i] = utils.ticks_add(t_ms, self.repeat_ms)
+            else:
+                self._held[i] = 3
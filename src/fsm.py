@@ -1,261 +1,150 @@
-class State:
-    def __init__(self, fsm):
-        self.FSM = fsm
-
-    def enter(self):
-        pass
-
-    def execute(self):
-        pass
-
-    def exit(self):
-        pass
-
-    def execute_default(self):
-        if self.FSM.alarm_status is True:
-            self.FSM.to_transition("toAlarming")
-
-
-class Alarming(State):
-    def __init__(self, fsm):
-        super().__init__(fsm)
-
-    def execute(self):
-        if self.FSM.alarm_status == False:
-            self.FSM.to_transition("toDefault")
-            return str("end_alarming")
-        return str("alarming")
-
-
-class Default(State):
-    def __init__(self, fsm):
-        super().__init__(fsm)
-
-    def execute(self):
-        self.execute_default()
-        if self.FSM.set_date == True:
-            self.FSM.to_transition("toSetYear")
-            return str("start_set_year")
-        elif self.FSM.set_time == True:
-            self.FSM.to_transition("toSetHour")
-            return str("start_set_hour")
-        elif self.FSM.set_alarm == True:
-            self.FSM.to_transition("toSetAlarmHour")
-            return str("start_set_alarm")
-        elif self.FSM.set_brightness == True:
-            self.FSM.to_transition("toSetBrightness")
-            return str("start_set_brightness")
-        else:
-            pass
-        return str("default")
-
-
-class SetYear(State):
-    def __init__(self, fsm):
-        super().__init__(fsm)
-
-    def execute(self):
-        self.execute_default()
-        if self.FSM.enter == True:
-            self.FSM.to_transition("toSetMonth")
-            return str("start_set_month")
-        elif self.FSM.back == True:
-            self.FSM.to_transition("toDefault")
-        else:
-            pass
-        return str("set_year")
-
-
-class SetMonth(State):
-    def __init__(self, fsm):
-        super().__init__(fsm)
-
-    def execute(self):
-        self.execute_default()
-        if self.FSM.enter == True:
-            self.FSM.to_transition("toSetDay")
-            return str("start_set_day")
-        elif self.FSM.back == True:
-            self.FSM.to_transition("toDefault")
-        else:
-            pass
-        return str("set_month")
-
-
-class SetDay(State):
-    def __init__(self, fsm):
-        super().__init__(fsm)
-
-    def execute(self):
-        self.execute_default()
-        if self.FSM.enter == True:
-            self.FSM.to_transition("toDefault")
-            return str("end_set_day")
-        elif self.FSM.back == True:
-            self.FSM.to_transition("toDefault")
-        else:
-            pass
-        return str("set_day")
-
-
-class SetHour(State):
-    def __init__(self, fsm):
-        super().__init__(fsm)
-
-    def execute(self):
-        self.execute_default()
-        if self.FSM.enter == True:
-            self.FSM.to_transition("toSetMin")
-            return str("start_set_min")
-        elif self.FSM.back == True:
-            self.FSM.to_transition("toDefault")
-        else:
-            pass
-        return str("set_hour")
-
-
-class SetMin(State):
-    def __init__(self, fsm):
-        super().__init__(fsm)
-
-    def execute(self):
-        self.execute_default()
-        if self.FSM.enter == True or self.FSM.back == True:
-            self.FSM.to_transition("toDefault")
-            return str("end_set_min")
-        else:
-            pass
-        return str("set_min")
-
-
-class SetAlarmHour(State):
-    def __init__(self, fsm):
-        super().__init__(fsm)
-
-    def execute(self):
-        self.execute_default()
-        if self.FSM.enter == True:
-            self.FSM.to_transition("toSetAlarmMin")
-            return str("start_set_alarm_min")
-        elif self.FSM.back == True:
-            self.FSM.to_transition("toDefault")
-            return str("set_no_alarm")
-        return str("set_alarm_hour")
-
-
-class SetAlarmMin(State):
-    def __init__(self, fsm):
-        super().__init__(fsm)
-
-    def execute(self):
-        self.execute_default()
-        if self.FSM.enter == True:
-            self.FSM.to_transition("toDefault")
-            return str("end_set_alarm_min")
-        elif self.FSM.back == True:
-            self.FSM.to_transition("toDefault")
-            return str("set_no_alarm")
-        return str("set_alarm_min")
-
-
-class SetBrightness(State):
-    def __init__(self, fsm):
-        super().__init__(fsm)
-
-    def execute(self):
-        self.execute_default()
-        if self.FSM.enter == True:
-            self.FSM.to_transition("toDefault")
-            return str("end_set_brightness")
-        elif self.FSM.back == True:
-            self.FSM.to_transition("toDefault")
-            return str("set_no_brightness")
-        return str("set_brightness")
-
-
-class Transition:
-    def __init__(self, tostate):
-        self.toState = tostate
-
-    def execute(self):
-        # return self.toState
-        pass
+# states
+DEFAULT = 0
+ALARMING = 1
+SET_YEAR = 2
+SET_MONTH = 3
+SET_DAY = 4
+SET_HOUR = 5
+SET_MIN = 6
+SET_ALARM_HOUR = 7
+SET_ALARM_MIN = 8
+SET_BRIGHTNESS = 9
+N_STATES = 10
+
+# events, drained from the input queue in order
+EV_NONE = 0  # timer tick, runs the steady action
+EV_ALARM = 1  # alarm started ringing
+EV_ALARM_OFF = 2  # alarm stopped, timed out or was reset
+EV_ENTER = 3
+EV_BACK = 4
+EV_SET_DATE = 5
+EV_SET_TIME = 6
+EV_SET_ALARM = 7
+EV_SET_BRIGHTNESS = 8
+EV_RF = 9  # RF remote button
+EV_ENCODER = 10  # encoder turned
+EV_NO_ALARM = 11  # long press on set alarm
+N_EVENTS = 12
+
+# actions, the index of the handler main runs for this tick
+A_DEFAULT = 0
+A_ALARMING = 1
+A_END_ALARMING = 2
+A_START_SET_YEAR = 3
+A_SET_YEAR = 4
+A_START_SET_MONTH = 5
+A_SET_MONTH = 6
+A_START_SET_DAY = 7
+A_SET_DAY = 8
+A_END_SET_DAY = 9
+A_START_SET_HOUR = 10
+A_SET_HOUR = 11
+A_START_SET_MIN = 12
+A_SET_MIN = 13
+A_END_SET_MIN = 14
+A_START_SET_ALARM = 15
+A_SET_ALARM_HOUR = 16
+A_START_SET_ALARM_MIN = 17
+A_SET_ALARM_MIN = 18
+A_END_SET_ALARM_MIN = 19
+A_SET_NO_ALARM = 20
+A_START_SET_BRIGHTNESS = 21
+A_SET_BRIGHTNESS = 22
+A_END_SET_BRIGHTNESS = 23
+A_SET_NO_BRIGHTNESS = 24
+A_SNOOZE = 25
+N_ACTIONS = 26
+
+STATE_NAMES = (
+    "default",
+    "alarming",
+    "set_year",
+    "set_month",
+    "set_day",
+    "set_hour",
+    "set_min",
+    "set_alarm_hour",
+    "set_alarm_min",
+    "set_brightness",
+)
+
+# action while staying in a state
+STEADY_ACTION = (
+    A_DEFAULT,
+    A_ALARMING,
+    A_SET_YEAR,
+    A_SET_MONTH,
+    A_SET_DAY,
+    A_SET_HOUR,
+    A_SET_MIN,
+    A_SET_ALARM_HOUR,
+    A_SET_ALARM_MIN,
+    A_SET_BRIGHTNESS,
+)
+
+# (state, event): (next state, action), anything missing stays put
+# and runs the steady action
+TRANSITIONS = {
+    (DEFAULT, EV_SET_DATE): (SET_YEAR, A_START_SET_YEAR),
+    (DEFAULT, EV_SET_TIME): (SET_HOUR, A_START_SET_HOUR),
+    (DEFAULT, EV_SET_ALARM): (SET_ALARM_HOUR, A_START_SET_ALARM),
+    (DEFAULT, EV_SET_BRIGHTNESS): (SET_BRIGHTNESS, A_START_SET_BRIGHTNESS),
+    (DEFAULT, EV_NO_ALARM): (DEFAULT, A_SET_NO_ALARM),
+    (SET_YEAR, EV_ENTER): (SET_MONTH, A_START_SET_MONTH),
+    (SET_YEAR, EV_BACK): (DEFAULT, A_SET_YEAR),
+    (SET_MONTH, EV_ENTER): (SET_DAY, A_START_SET_DAY),
+    (SET_MONTH, EV_BACK): (DEFAULT, A_SET_MONTH),
+    (SET_DAY, EV_ENTER): (DEFAULT, A_END_SET_DAY),
+    (SET_DAY, EV_BACK): (DEFAULT, A_SET_DAY),
+    (SET_HOUR, EV_ENTER): (SET_MIN, A_START_SET_MIN),
+    (SET_HOUR, EV_BACK): (DEFAULT, A_SET_HOUR),
+    (SET_MIN, EV_ENTER): (DEFAULT, A_END_SET_MIN),
+    (SET_MIN, EV_BACK): (DEFAULT, A_END_SET_MIN),
+    (SET_ALARM_HOUR, EV_ENTER): (SET_ALARM_MIN, A_START_SET_ALARM_MIN),
+    (SET_ALARM_HOUR, EV_BACK): (DEFAULT, A_SET_NO_ALARM),
+    (SET_ALARM_MIN, EV_ENTER): (DEFAULT, A_END_SET_ALARM_MIN),
+    (SET_ALARM_MIN, EV_BACK): (DEFAULT, A_SET_NO_ALARM),
+    (SET_BRIGHTNESS, EV_ENTER): (DEFAULT, A_END_SET_BRIGHTNESS),
+    (SET_BRIGHTNESS, EV_BACK): (DEFAULT, A_SET_NO_BRIGHTNESS),
+}
+
+
+def build_table(transitions: dict) -> tuple:
+    """
+    Flatten the transition dict into two bytearrays indexed by
+    state * N_EVENTS + event, so a tick is two lookups and no allocation
+    """
+    next_state = bytearray(N_STATES * N_EVENTS)
+    action = bytearray(N_STATES * N_EVENTS)
+    for state in range(N_STATES):
+        for event in range(N_EVENTS):
+            idx = state * N_EVENTS + event
+            if state == ALARMING:
+                # rings until the alarm stops or is dismissed, RF snoozes it
+                if event == EV_RF:
+                    next_state[idx], action[idx] = DEFAULT, A_SNOOZE
+                elif event in (EV_ALARM_OFF, EV_ENTER, EV_BACK):
+                    next_state[idx], action[idx] = DEFAULT, A_END_ALARMING
+                else:
+                    next_state[idx], action[idx] = ALARMING, A_ALARMING
+            elif event == EV_ALARM:
+                next_state[idx], action[idx] = ALARMING, STEADY_ACTION[state]
+            else:
+                next_state[idx], action[idx] = transitions.get(
+                    (state, event), (state, STEADY_ACTION[state])
+                )
+    return next_state, action
 
 
 class FSM:
     def __init__(self):
-        self.states = {}
-        self.transitions = {}
-        self.curState = None
-        self.prevState = None
-        self.trans = None
-
-        self.enter = False
-        self.back = False
-        self.set_date = False
-        self.set_time = False
-        self.set_alarm = False
-        self.set_brightness = False
-
-        self.alarm_status = False
-
-        self.add_state("default", Default(self))
-        self.add_state("alarming", Alarming(self))
-        self.add_state("set_year", SetYear(self))
-        self.add_state("set_month", SetMonth(self))
-        self.add_state("set_day", SetDay(self))
-        self.add_state("set_hour", SetHour(self))
-        self.add_state("set_min", SetMin(self))
-        self.add_state("set_alarm_hour", SetAlarmHour(self))
-        self.add_state("set_alarm_min", SetAlarmMin(self))
-        self.add_state("set_brightness", SetBrightness(self))
-
-        self.add_transition("toAlarming", Transition("alarming"))
-        self.add_transition("toSetYear", Transition("set_year"))
-        self.add_transition("toSetMonth", Transition("set_month"))
-        self.add_transition("toSetDay", Transition("set_day"))
-        self.add_transition("toSetHour", Transition("set_hour"))
-        self.add_transition("toSetMin", Transition("set_min"))
-        self.add_transition("toSetAlarmHour", Transition("set_alarm_hour"))
-        self.add_transition("toSetAlarmMin", Transition("set_alarm_min"))
-        self.add_transition("toSetBrightness", Transition("set_brightness"))
-        self.add_transition("toDefault", Transition("default"))
-
-        self.setstate("default")
-
-    def add_transition(self, transname, transition):
-        self.transitions[transname] = transition
-
-    def add_state(self, statename, state):
-        self.states[statename] = state
-
-    def setstate(self, statename):
-        # look for whatever state we passed in within the states dict
-        self.prevState = self.curState
-        self.curState = self.states[statename]
-
-    def to_transition(self, to_trans):
-        # set the transition state
-        self.trans = self.transitions[to_trans]
-
-    def execute(
-        self, enter, back, set_date, set_time, set_alarm, set_brightness, alarm_status
-    ):
-        self.enter = enter
-        self.back = back
-        self.set_date = set_date
-        self.set_time = set_time
-        self.set_alarm = set_alarm
-        self.set_brightness = set_brightness
-        self.alarm_status = alarm_status
-
-        if self.trans:
-            self.curState.exit()
-            self.trans.execute()
-            self.setstate(self.trans.toState)
-            self.curState.enter()
-            self.trans = None
-
-        output = self.curState.execute()
-
-        return output
+        self._next_state, self._action = build_table(TRANSITIONS)
+        self.state = DEFAULT
+        self.prev_state = DEFAULT
+
+    def execute(self, event: int) -> int:
+        # returns the action to run this tick, the new state applies next tick
+        idx = self.state * N_EVENTS + event
+        self.prev_state = self.state
+        self.state = self._next_state[idx]
+        return self._action[idx]
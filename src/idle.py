@@ -0,0 +1,76 @@
+import time
+
+import fsm as fsm_ids
+
+IDLE_AFTER_MS = 10000  # no input for this long before sleeping
+ALARM_GUARD_S = 120  # stay awake when the alarm is this close
+SLEEP_MIN_S = 2  # shorter sleeps aren't worth releasing the pins for
+
+
+def idle_sleep_s(
+    state: int,
+    usb: bool,
+    busy: bool,
+    sec: int,
+    quiet_ms: int,
+    alarm_in_s: int = None,
+) -> int:
+    """
+    How long to light sleep for, 0 to stay awake. Only sleeps on battery,
+    in the default state, with nothing in progress and the alarm not close
+    state = FSM state
+    usb = running on USB power
+    busy = events queued or an e-ink refresh running
+    sec = seconds field of the current time
+    quiet_ms = time since the last input
+    alarm_in_s = seconds until the next alarm, None if it is off
+    """
+    if usb or busy or state != fsm_ids.DEFAULT:
+        return 0
+    if quiet_ms < IDLE_AFTER_MS:
+        return 0
+    if alarm_in_s is not None and alarm_in_s <= ALARM_GUARD_S:
+        return 0
+    # until the display has a new minute to show
+    seconds = 60 - sec
+    if seconds < SLEEP_MIN_S:
+        return 0
+    return seconds
+
+
+class IdleSleep:
+    """
+    Light sleeps until a timeout or input
+    :param alarm: The alarm module, passed in so it can be stubbed
+    :param inputs: Objects with a pin attribute and release() and claim()
+        methods, their pins wake the board on a falling edge. A pin can't be
+        both claimed by its driver and used as an alarm, so they are
+        released for the duration of the sleep
+    """
+
+    def __init__(self, alarm, inputs: tuple):
+        self.alarm = alarm
+        self.inputs = inputs
+        self.sleeps = 0
+        self.input_wakes = 0  # sleeps ended early by input
+
+    def sleep(self, seconds: int) -> bool:
+        # blocks, returns True if woken by input
+        alarm = self.alarm
+        for inp in self.inputs:
+            inp.release()
+        try:
+            timeout = alarm.time.TimeAlarm(monotonic_time=time.monotonic() + seconds)
+            wakes = [
+                alarm.pin.PinAlarm(inp.pin, value=False, edge=True, pull=True)
+                for inp in self.inputs
+            ]
+            woke = alarm.light_sleep_until_alarms(timeout, *wakes)
+        finally:
+            for inp in self.inputs:
+                inp.claim()
+        self.sleeps += 1
+        by_input = isinstance(woke, alarm.pin.PinAlarm)
+        if by_input:
+            self.input_wakes += 1
+        return by_input
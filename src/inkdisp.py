@@ -8,9 +8,19 @@ import displayio
 import terminalio
 import vectorio
 import busio
-import adafruit_ssd1680
 import supervisor
+from array import array
 from adafruit_display_text.bitmap_label import Label
+import inklayout
+from inklayout import Layout
+from sparkline import Sparkline
+
+try:
+    from epaperdisplay import EPaperDisplay
+    from fourwire import FourWire
+except ImportError:
+    from displayio import EPaperDisplay
+    from displayio import FourWire
 
 # print('free memory left after imports: ', gc.mem_free())
 
@@ -18,36 +28,112 @@ supervisor.runtime.autoreload = False
 
 displayio.release_displays()
 
+# SSD1680 init, same as adafruit_ssd1680 except that the border and the
+# display update mode are patched per refresh mode
+_START_SEQUENCE = (
+    b"\x12\x80\x14"  # soft reset and wait 20ms
+    b"\x11\x01\x03"  # ram data entry mode
+    b"\x3c\x01\x05"  # border color
+    b"\x2c\x01\x36"  # set vcom voltage
+    b"\x03\x01\x17"  # set gate voltage
+    b"\x04\x03\x41\xae\x32"  # set source voltage
+    b"\x4e\x01\x01"  # ram x count
+    b"\x4f\x02\x00\x00"  # ram y count
+    b"\x01\x03\x00\x00\x00"  # set display size
+    b"\x22\x01\xf4"  # display update mode
+)
+_STOP_SEQUENCE = b"\x10\x81\x01\x64"  # deep sleep
+_IDX_BORDER = 8
+_IDX_SIZE = 29
+_IDX_UPDATE_MODE = 34
+_BORDER_FULL = 0x05
+_BORDER_PARTIAL = 0x80
+_UPDATE_FULL = 0xF4  # clock, analog, temperature, LUT, display mode 1 (full)
+_UPDATE_PARTIAL = 0xFC  # same, display mode 2 (partial)
+
+# upper edges of the refresh duration histogram bins, ms, plus one overflow bin
+REFRESH_BINS_MS = (250, 500, 1000, 2000, 4000, 8000)
+
+
+def ssd1680_sequence(gates: int, partial: bool) -> bytearray:
+    """
+    SSD1680 init sequence for either a full or a partial waveform.
+    displayio already only sends the dirty areas of the group, the
+    partial waveform makes the panel only flip the pixels that changed
+    :param int gates: Panel rows along the gate lines
+    """
+    start_sequence = bytearray(_START_SEQUENCE)
+    start_sequence[_IDX_SIZE] = (gates - 1) & 0xFF
+    start_sequence[_IDX_SIZE + 1] = ((gates - 1) >> 8) & 0xFF
+    if partial:
+        start_sequence[_IDX_BORDER] = _BORDER_PARTIAL
+        start_sequence[_IDX_UPDATE_MODE] = _UPDATE_PARTIAL
+    else:
+        start_sequence[_IDX_BORDER] = _BORDER_FULL
+        start_sequence[_IDX_UPDATE_MODE] = _UPDATE_FULL
+    return start_sequence
+
+
+def ssd1680_display(
+    display_bus: FourWire, start_sequence: bytearray, **kwargs
+) -> EPaperDisplay:
+    """
+    SSD1680 panel, black and white only. Partial mode compares the new
+    frame in RAM 0x24 with the previous one in 0x26, so no colour plane
+    is written there
+    """
+    return EPaperDisplay(
+        display_bus,
+        start_sequence,
+        _STOP_SEQUENCE,
+        **kwargs,
+        ram_width=250,
+        ram_height=296,
+        busy_state=True,
+        write_black_ram_command=0x24,
+        black_bits_inverted=False,
+        set_column_window_command=0x44,
+        set_row_window_command=0x45,
+        set_current_column_command=0x4E,
+        set_current_row_command=0x4F,
+        refresh_display_command=0x20,
+        always_toggle_chip_select=True,
+        address_little_endian=True,
+    )
+
+
+class InkDisp(Layout):
+    """
+    The e-ink panel, Layout holds the labels and the field setters.
+    inkhost renders the same layout into a framebuffer on a PC
+    """
 
-class InkDisp:
     def __init__(
         self,
         cs,
         dc,
         reset,
+        busy,
         date_init: str,
         alarm_init: str,
-        temp_init: str,
-        humidity_init: str,
-        batt_init: str,
-        usb_init: str,
+        temp_init: float,
+        humidity_init: float,
+        batt_init: float,
+        usb_init: bool,
     ):
-        spi = busio.SPI(clock=board.GP18, MOSI=board.GP19, MISO=None)
-        # epd_busy = board.GP16
-        display_bus = displayio.FourWire(
-            spi, command=dc, chip_select=cs, reset=reset, baudrate=1000000
-        )
-        # time.sleep(1)
-        # For issues with display not updating top/bottom rows correctly set colstart to 8
-        display = adafruit_ssd1680.SSD1680(
-            # for 2.13" 250x122 display (waveshare 12672)
-            display_bus,
-            colstart=0,
-            width=250,
-            height=122,
-            highlight_color=0xFF0000,
-            rotation=90,
-        )
+        self.spi = busio.SPI(clock=board.GP18, MOSI=board.GP19, MISO=None)
+        self.pins = (cs, dc, reset, busy)
+        self.partial = False
+        self._pending = False  # a refresh was requested while one was running
+        self._pending_full = False
+        self._refreshing = False
+        self._refresh_full = False
+        self._refresh_start_ms = 0
+        self.refresh_ms = 0  # duration of the last refresh
+        self.hist_full = array("H", [0] * (len(REFRESH_BINS_MS) + 1))
+        self.hist_partial = array("H", [0] * (len(REFRESH_BINS_MS) + 1))
+        self._build_display()
+        display = self.display
         # create displayio group
         g = displayio.Group()
 
@@ -59,7 +145,6 @@ class InkDisp:
         for i in range(0, n):
             p[i] = color_list[i]
 
-        self.display = display
         self.width = display.width
         self.height = display.height
         self.g = g
@@ -67,8 +152,10 @@ class InkDisp:
 
         self.color_list = color_list
 
-        # initialization routine
+        # initialization routine, the layout is built once and only the
+        # text of the value labels changes afterwards
         self.draw_bg(color="white")
+        self.build_layout()
         self.apply_info(
             date=date_init,
             alarm=alarm_init,
@@ -77,16 +164,91 @@ class InkDisp:
             batt=batt_init,
             usb=usb_init,
         )
-        self.update()
+        self.request_refresh(full=True)
+
+    def _build_display(self):
+        cs, dc, reset, busy = self.pins
+        display_bus = FourWire(
+            self.spi, command=dc, chip_select=cs, reset=reset, baudrate=1000000
+        )
+        # for 2.13" 250x122 display (waveshare 12672), rotated 90 degrees so
+        # the 250 pixel side runs along the gate lines
+        self._sequences = (
+            ssd1680_sequence(250, partial=False),
+            ssd1680_sequence(250, partial=True),
+        )
+        # time.sleep(1)
+        # For issues with display not updating top/bottom rows correctly set colstart to 8
+        self.display = ssd1680_display(
+            display_bus,
+            self._sequences[False],
+            colstart=0,
+            width=250,
+            height=122,
+            rotation=90,
+            busy_pin=busy,
+            seconds_per_frame=180,
+        )
+        self.partial = False
+
+    def _set_mode(self, partial: bool):
+        # the refresh mode is part of the init sequence, which is sent
+        # before every refresh, so the display and its dirty areas are kept.
+        # Partial refreshes are cheap, full ones keep the panel's 3 minutes
+        self.display.update_refresh_mode(
+            self._sequences[partial], seconds_per_frame=1 if partial else 180
+        )
+        self.partial = partial
+
+    def request_refresh(self, full: bool = False):
+        """
+        Queue a refresh, requests made while the panel is busy are merged
+        into one that starts as soon as it is free
+        """
+        self._pending = True
+        self._pending_full |= full
+        self.poll()
 
-    def clear(self):
-        # clear the group
-        self.g = displayio.Group()
+    def poll(self):
+        # call regularly, tracks the running refresh and starts a queued one
+        if self._refreshing and not self.display.busy:
+            self._refreshing = False
+            self.refresh_ms = utils.ticks_diff(
+                supervisor.ticks_ms(), self._refresh_start_ms
+            )
+            hist = self.hist_full if self._refresh_full else self.hist_partial
+            i = 0
+            while i < len(REFRESH_BINS_MS) and self.refresh_ms >= REFRESH_BINS_MS[i]:
+                i += 1
+            hist[i] += 1
+        if self._pending and self.refresh_done:
+            self.start_refresh(full=self._pending_full)
 
-    def update(self):
-        # Add the Group to the Display
-        self.display.root_group = self.g
+    def start_refresh(self, full: bool):
+        """
+        Start a refresh and return without waiting for the panel. The
+        caller decides when a full one is needed to clear ghosting
+        """
+        if self.partial == full:
+            self._set_mode(partial=not full)
+        if self.display.root_group is not self.g:
+            self.display.root_group = self.g
         self.display.refresh()
+        self._pending = False
+        self._pending_full = False
+        self._refreshing = True
+        self._refresh_full = full
+        self._refresh_start_ms = supervisor.ticks_ms()
+
+    @property
+    def busy(self) -> bool:
+        # a refresh is running or queued
+        return self._refreshing or self._pending
+
+    @property
+    def refresh_done(self) -> bool:
+        # nothing running and the panel's minimum refresh interval has passed
+        return not self.display.busy and self.display.time_to_refresh == 0
 
     def get_idx(self, color: str):
         """
@@ -95,40 +257,43 @@ class InkDisp:
         return self.color_names.index(color)
 
     def draw_text(
-        self, text: str, x: int, y: int, color: str = "black", scale: int = 1
-    ):
+        self,
+        text: str,
+        x: int,
+        y: int,
+        color: str = "black",
+        scale: int = 1,
+        anchor_x: float = 0.5,
+    ) -> Label:
         # display = self.display
-        lbl = Label(terminalio.FONT, text=text, color=utils.colors[color], scale=1)
-        lbl.anchor_point = (0.5, 0.5)
+        lbl = Label(terminalio.FONT, text=text, color=utils.colors[color], scale=scale)
+        lbl.anchor_point = (anchor_x, 0.5)
         lbl.anchored_position = (x, y)  # (display.width // 2, display.height // 2)
         self.g.append(lbl)
-        return None
+        return lbl
 
-    def apply_info(
-        self, date: str, alarm: str, temp: str, humidity: str, batt: float, usb: float
-    ):
-        display = self.display
-        x_center = display.width // 2
-        y_center = display.height // 2
-        usb_msg = "USB In" if usb else "Unplugged"
-        self.draw_text(
-            text=usb_msg,
-            x=x_center,
-            y=y_center - 30,
-        )
-        self.draw_text(
-            text="Batt: " + str(batt * 100) + "%",
-            x=x_center,
-            y=y_center - 15,
-        )
-        self.draw_text(text="Alarm: " + alarm, x=x_center, y=y_center)
-        self.draw_text(text=date, x=x_center, y=y_center + 30, scale=2)
-        self.draw_text(
-            text=temp + " °C, " + humidity + " % Humid",
-            x=x_center,
-            y=y_center + 60,
+    def make_label(
+        self, text: str, x: int, y: int, anchor_x: float, scale: int
+    ) -> Label:
+        return self.draw_text(text=text, x=x, y=y, scale=scale, anchor_x=anchor_x)
+
+    def make_sparkline(self, x: int, y: int, lo, hi) -> Sparkline:
+        # one tile per bitmap column, so scrolling doesn't touch the pixels
+        width = inklayout.SPARK_COLUMNS
+        height = inklayout.SPARK_HEIGHT
+        bitmap = displayio.Bitmap(width, height, 2)
+        grid = displayio.TileGrid(
+            bitmap,
+            pixel_shader=self.p,
+            width=width,
+            height=1,
+            tile_width=1,
+            tile_height=height,
+            x=x,
+            y=y,
         )
-        return None
+        self.g.append(grid)
+        return Sparkline(bitmap, grid, x, y, width, height, lo, hi)
 
     def draw_polygon(self, points: list, color: str):
         """
@@ -0,0 +1,267 @@
+"""
+Host side backend for the e-ink layout, runs on a PC with plain Python.
+Renders the same layout as InkDisp into a 1-bit framebuffer, times each
+render and counts the pixels that changed since the previous one, which
+is what a refresh costs on the panel. Frames can be written out as PBM or
+PNG and compared against golden images
+
+terminalio.FONT is Terminus 6x12, the same font is in the CircuitPython
+source tree as tools/fonts/ter-u12n.bdf
+
+python inkhost.py ter-u12n.bdf out.png
+"""
+
+import struct
+import sys
+import time
+import zlib
+
+import inklayout
+from inklayout import HEIGHT, WIDTH, Layout
+from sparkline import Sparkline
+
+# popcount of every byte, for counting changed pixels
+_BITS = bytes(bin(i).count("1") for i in range(256))
+
+
+class BDFFont:
+    """
+    Minimal BDF bitmap font reader
+    :param str path: BDF file
+    """
+
+    def __init__(self, path: str):
+        self.glyphs = {}  # codepoint: (dwidth, w, h, x_off, y_off, rows)
+        self.ascent = 0
+        self.descent = 0
+        with open(path) as f:
+            lines = iter(f.read().splitlines())
+        for line in lines:
+            words = line.split()
+            if not words:
+                continue
+            if words[0] == "FONT_ASCENT":
+                self.ascent = int(words[1])
+            elif words[0] == "FONT_DESCENT":
+                self.descent = int(words[1])
+            elif words[0] == "STARTCHAR":
+                self._read_char(lines)
+        self.height = self.ascent + self.descent
+        self.default = self.glyphs.get(ord(" "), (self.height // 2, 0, 0, 0, 0, ()))
+
+    def _read_char(self, lines):
+        code = -1
+        dwidth = 0
+        bbx = (0, 0, 0, 0)
+        for line in lines:
+            words = line.split()
+            if words[0] == "ENCODING":
+                code = int(words[1])
+            elif words[0] == "DWIDTH":
+                dwidth = int(words[1])
+            elif words[0] == "BBX":
+                bbx = tuple(int(w) for w in words[1:5])
+            elif words[0] == "BITMAP":
+                break
+        w, h, x_off, y_off = bbx
+        # rows are left aligned and padded to whole bytes
+        n_bits = ((w + 7) // 8) * 8
+        rows = tuple(int(next(lines), 16) << (32 - n_bits) for _ in range(h))
+        next(lines)  # ENDCHAR
+        if code >= 0:
+            self.glyphs[code] = (dwidth, w, h, x_off, y_off, rows)
+
+    def glyph(self, char: str) -> tuple:
+        return self.glyphs.get(ord(char), self.default)
+
+    def text_width(self, text: str) -> int:
+        return sum(self.glyph(c)[0] for c in text)
+
+
+class HostLabel:
+    def __init__(self, text: str, x: int, y: int, anchor_x: float, scale: int):
+        self.text = text
+        self.x = x
+        self.y = y
+        self.anchor_x = anchor_x
+        self.scale = scale
+
+
+class HostBitmap:
+    # stands in for displayio.Bitmap, one byte per pixel
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.data = bytearray(width * height)
+
+    def __getitem__(self, xy: tuple) -> int:
+        return self.data[xy[1] * self.width + xy[0]]
+
+    def __setitem__(self, xy: tuple, value: int):
+        self.data[xy[1] * self.width + xy[0]] = value
+
+
+class HostDisp(Layout):
+    """
+    InkDisp's layout drawn into a framebuffer, 1 bit per pixel, rows
+    padded to whole bytes, MSB first, 1 = black like PBM
+    :param BDFFont font: Font standing in for terminalio.FONT
+    """
+
+    def __init__(self, font: BDFFont, width: int = WIDTH, height: int = HEIGHT):
+        self.font = font
+        self.width = width
+        self.height = height
+        self.stride = (width + 7) // 8
+        self.frame = bytearray(self.stride * height)
+        self._prev = bytearray(self.stride * height)
+        self.frames = 0
+        self.render_ms = 0.0  # duration of the last render
+        self.changed_px = 0  # pixels that differ from the previous frame
+        self.build_layout()
+
+    def make_label(
+        self, text: str, x: int, y: int, anchor_x: float, scale: int
+    ) -> HostLabel:
+        return HostLabel(text, x, y, anchor_x, scale)
+
+    def make_sparkline(self, x: int, y: int, lo, hi) -> Sparkline:
+        width = inklayout.SPARK_COLUMNS
+        height = inklayout.SPARK_HEIGHT
+        tiles = [0] * width
+        return Sparkline(HostBitmap(width, height), tiles, x, y, width, height, lo, hi)
+
+    def render(self) -> int:
+        """
+        Redraw every label and sparkline, returns the number of pixels that changed
+        since the previous render
+        """
+        start = time.perf_counter()
+        self._prev[:] = self.frame
+        frame = self.frame
+        for i in range(len(frame)):
+            frame[i] = 0  # white background
+        for lbl in self.labels:
+            self._draw_label(lbl)
+        for spark in self.sparklines:
+            self._draw_sparkline(spark)
+        self.render_ms = (time.perf_counter() - start) * 1000
+        self.changed_px = count_diff(frame, self._prev)
+        self.frames += 1
+        return self.changed_px
+
+    def _draw_label(self, lbl: HostLabel):
+        # anchored like bitmap_label, vertically centred on the font's box,
+        # every font pixel drawn as a scale x scale square
+        font = self.font
+        scale = lbl.scale
+        x = round(lbl.x - lbl.anchor_x * font.text_width(lbl.text) * scale)
+        top = round(lbl.y - font.height * scale / 2)
+        for char in lbl.text:
+            dwidth, w, h, x_off, y_off, rows = font.glyph(char)
+            y = top + (font.ascent - y_off - h) * scale
+            for row, bits in enumerate(rows):
+                for col in range(w):
+                    if bits & (0x80000000 >> col):
+                        self._fill(x + (x_off + col) * scale, y + row * scale, scale)
+            x += dwidth * scale
+
+    def _fill(self, x: int, y: int, size: int):
+        for dy in range(size):
+            for dx in range(size):
+                self.set_pixel(x + dx, y + dy)
+
+    def _draw_sparkline(self, spark: Sparkline):
+        # screen column i shows bitmap column tiles[i], like the TileGrid
+        for i in range(spark.width):
+            col = spark.tiles[i]
+            for row in range(spark.height):
+                if spark.bitmap[col, row]:
+                    self.set_pixel(spark.x + i, spark.y + row)
+
+    def set_pixel(self, x: int, y: int):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.frame[y * self.stride + (x >> 3)] |= 0x80 >> (x & 7)
+
+    def get_pixel(self, x: int, y: int) -> int:
+        return (self.frame[y * self.stride + (x >> 3)] >> (7 - (x & 7))) & 1
+
+    def write_pbm(self, path: str):
+        with open(path, "wb") as f:
+            f.write(b"P4\n%d %d\n" % (self.width, self.height))
+            f.write(self.frame)
+
+    def write_png(self, path: str):
+        # 1-bit greyscale PNG, where 0 is black, so the bits are inverted
+        raw = bytearray()
+        for y in range(self.height):
+            raw.append(0)  # no filter
+            row = self.frame[y * self.stride : (y + 1) * self.stride]
+            raw.extend(b ^ 0xFF for b in row)
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            crc = zlib.crc32(kind + data) & 0xFFFFFFFF
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 1, 0, 0, 0, 0)
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            f.write(chunk(b"IHDR", header))
+            f.write(chunk(b"IDAT", zlib.compress(bytes(raw))))
+            f.write(chunk(b"IEND", b""))
+
+
+def read_pbm(path: str) -> tuple:
+    """
+    Read a binary PBM, returns (width, height, frame) in HostDisp's format
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    fields = []
+    i = 0
+    while len(fields) < 3:
+        while data[i : i + 1].isspace():
+            i += 1
+        if data[i : i + 1] == b"#":
+            i = data.index(b"\n", i)
+            continue
+        j = i
+        while not data[j : j + 1].isspace():
+            j += 1
+        fields.append(data[i:j])
+        i = j
+    if fields[0] != b"P4":
+        raise ValueError("not a binary PBM")
+    width, height = int(fields[1]), int(fields[2])
+    return width, height, bytearray(data[i + 1 :])
+
+
+def count_diff(a: bytes, b: bytes) -> int:
+    # number of pixels that differ between two frames of the same size
+    return sum(_BITS[x ^ y] for x, y in zip(a, b))
+
+
+if __name__ == "__main__":
+    disp = HostDisp(BDFFont(sys.argv[1]))
+    disp.apply_info(
+        date="Sat, Jan 01 2000",
+        alarm="07:30",
+        temp=21.5,
+        humidity=40,
+        batt=0.8,
+        usb=False,
+    )
+    for i in range(inklayout.SPARK_COLUMNS):
+        disp.push_samples(temp=20 + i % 24 / 4, humidity=40 + i % 7, batt=1 - i / 200)
+    disp.render()
+    print("first frame: {:.2f} ms, {} px".format(disp.render_ms, disp.changed_px))
+    disp.set_power(0.79, False)
+    disp.render()
+    print("battery tick: {:.2f} ms, {} px".format(disp.render_ms, disp.changed_px))
+    disp.push_samples(temp=21.5, humidity=40, batt=0.79)
+    disp.render()
+    print("sparkline step: {:.2f} ms, {} px".format(disp.render_ms, disp.changed_px))
+    out = sys.argv[2] if len(sys.argv) > 2 else "frame.pbm"
+    if out.endswith(".png"):
+        disp.write_png(out)
+    else:
+        disp.write_pbm(out)
@@ -0,0 +1,153 @@
+# panel size in pixels, after rotation
+WIDTH = 250
+HEIGHT = 122
+
+# labels, in drawing order
+LBL_USB = 0
+LBL_BATT_PREFIX = 1
+LBL_BATT = 2
+LBL_ALARM_PREFIX = 3
+LBL_ALARM = 4
+LBL_DATE = 5
+LBL_ENV = 6
+LBL_ENV_RANGE = 7
+N_LABELS = 8
+
+# (x, y offset from the panel center, anchor_x, scale, static text)
+# value labels start empty and are filled in by the field setters
+LABELS = (
+    (0, -30, 0.5, 1, ""),
+    (0, -15, 1.0, 1, "Batt: "),
+    (0, -15, 0.0, 1, ""),
+    (0, 0, 1.0, 1, "Alarm: "),
+    (0, 0, 0.0, 1, ""),
+    (0, 30, 0.5, 2, ""),
+    (0, 60, 0.5, 1, ""),
+    (0, 14, 0.5, 1, ""),
+)
+
+
+# 24 h sparklines along the top edge, above the labels
+SPARK_TEMP = 0
+SPARK_HUMIDITY = 1
+SPARK_BATT = 2
+N_SPARKS = 3
+SPARK_COLUMNS = 80
+SPARK_HEIGHT = 18
+# (x, y, lo, hi), values outside lo - hi are clipped
+SPARKLINES = (
+    (0, 2, 10, 35),  # °C
+    (85, 2, 0, 100),  # %RH
+    (170, 2, 0, 100),  # battery %
+)
+
+
+def usb_text(usb: bool) -> str:
+    return "USB In" if usb else "Unplugged"
+
+
+def batt_text(batt: float) -> str:
+    return "{:.0f}%".format(batt * 100)
+
+
+def env_text(temp: float, humidity: float) -> str:
+    return "{:.1f} °C, {:.0f} % Humid".format(temp, humidity)
+
+
+def env_range_text(temp_stats: tuple, humidity_stats: tuple) -> str:
+    # (min, max, mean) over the last 24 h, empty until there is a sample
+    if temp_stats is None or humidity_stats is None:
+        return ""
+    t_min, t_max, t_mean = temp_stats
+    h_min, h_max, _ = humidity_stats
+    return "24h {:.1f}-{:.1f} °C avg {:.1f}, {:.0f}-{:.0f} %".format(
+        t_min, t_max, t_mean, h_min, h_max
+    )
+
+
+class Layout:
+    """
+    The panel's labels and what goes in them, independent of how they are
+    drawn. A backend subclasses this, sets width and height, and calls
+    build_layout() once its drawing surface exists. It provides
+    make_label(text, x, y, anchor_x, scale), returning an object with a
+    writable text attribute, and make_sparkline(x, y, lo, hi), returning
+    a SPARK_COLUMNS x SPARK_HEIGHT Sparkline
+    """
+
+    def build_layout(self):
+        """
+        Create every label once. The static prefixes are their own labels,
+        so their glyph bitmaps are rendered once and never touched again
+        """
+        x_center = self.width // 2
+        y_center = self.height // 2
+        self.labels = [
+            self.make_label(
+                text=text,
+                x=x_center + dx,
+                y=y_center + dy,
+                anchor_x=anchor_x,
+                scale=scale,
+            )
+            for dx, dy, anchor_x, scale, text in LABELS
+        ]
+        self.lbl_usb = self.labels[LBL_USB]
+        self.lbl_batt = self.labels[LBL_BATT]
+        self.lbl_alarm = self.labels[LBL_ALARM]
+        self.lbl_date = self.labels[LBL_DATE]
+        self.lbl_env = self.labels[LBL_ENV]
+        self.lbl_env_range = self.labels[LBL_ENV_RANGE]
+        self.sparklines = [
+            self.make_sparkline(x=x, y=y, lo=lo, hi=hi) for x, y, lo, hi in SPARKLINES
+        ]
+
+    def set_text(self, lbl, text: str) -> bool:
+        # only re-render the label if its text changed
+        if lbl.text == text:
+            return False
+        lbl.text = text
+        return True
+
+    def apply_info(
+        self,
+        date: str,
+        alarm: str,
+        temp: float,
+        humidity: float,
+        batt: float,
+        usb: bool,
+    ) -> bool:
+        # returns True if anything on the panel changed
+        changed = self.set_power(batt, usb)
+        changed |= self.set_alarm(alarm)
+        changed |= self.set_date(date)
+        changed |= self.set_env(temp, humidity)
+        return changed
+
+    # per field setters, each returns True if its field changed
+    def set_date(self, date: str) -> bool:
+        return self.set_text(self.lbl_date, date)
+
+    def set_alarm(self, alarm: str) -> bool:
+        return self.set_text(self.lbl_alarm, alarm)
+
+    def set_power(self, batt: float, usb: bool) -> bool:
+        changed = self.set_text(self.lbl_usb, usb_text(usb))
+        changed |= self.set_text(self.lbl_batt, batt_text(batt))
+        return changed
+
+    def set_env(self, temp: float, humidity: float) -> bool:
+        return self.set_text(self.lbl_env, env_text(temp, humidity))
+
+    def set_env_range(self, temp_stats: tuple, humidity_stats: tuple) -> bool:
+        return self.set_text(
+            self.lbl_env_range, env_range_text(temp_stats, humidity_stats)
+        )
+
+    def push_samples(self, temp: float, humidity: float, batt: float) -> bool:
+        # one new column on each sparkline, batt = 0 - 1
+        self.sparklines[SPARK_TEMP].push(temp)
+        self.sparklines[SPARK_HUMIDITY].push(humidity)
+        self.sparklines[SPARK_BATT].push(batt * 100)
+        return True
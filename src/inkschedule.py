@@ -0,0 +1,121 @@
+from array import array
+
+import epoch
+import utils
+
+# e-ink fields, in priority order
+FIELD_ALARM = 0
+FIELD_DATE = 1
+FIELD_POWER = 2  # battery and usb
+FIELD_ENV = 3  # temperature and humidity
+N_FIELDS = 4
+
+# what due() asks for
+REFRESH_NONE = 0
+REFRESH_PARTIAL = 1
+REFRESH_FULL = 2
+
+# why a due refresh is being held back
+_HELD_INTERVAL = 1
+_HELD_BUDGET = 2
+
+
+class RefreshScheduler:
+    """
+    Decides when the e-ink panel refreshes and how
+    :param tuple window_ms: Per field, how long a change waits for others to
+        coalesce with it, so higher priority fields get shorter windows
+    :param int min_interval_ms: Minimum time between two refreshes
+    :param int daily_budget: Refreshes per day, once spent only the alarm
+        field can still trigger one
+    :param int full_every: Partials between full refreshes, a date change
+        also gets a full refresh since it happens once a day anyway
+    """
+
+    def __init__(
+        self,
+        window_ms: tuple = (2000, 10000, 300000, 300000),
+        min_interval_ms: int = 5000,
+        daily_budget: int = 500,
+        full_every: int = 10,
+    ):
+        self.window_ms = window_ms
+        self.min_interval_ms = min_interval_ms
+        self.daily_budget = daily_budget
+        self.full_every = full_every
+        self._dirty = bytearray(N_FIELDS)
+        self._dirty_since = array("l", [0] * N_FIELDS)  # ticks_ms of first change
+        self._last_refresh = None
+        self._day = -1
+        self._n_partial = 0
+        self._held = 0  # _HELD_* reasons already counted for the due refresh
+        # decision counters
+        self.marks = array("L", [0] * N_FIELDS)  # changes reported per field
+        self.coalesced = 0  # changes that rode along on another refresh
+        self.refreshes_today = 0
+        self.partials = 0
+        self.fulls = 0
+        # due refreshes held back, each counted once however long it waits
+        self.deferred_interval = 0  # by min_interval_ms
+        self.deferred_budget = 0  # by the daily budget
+
+    def mark(self, field: int, now_ms: int) -> None:
+        # a field changed on the panel, now_ms = supervisor.ticks_ms()
+        self.marks[field] += 1
+        if self._dirty[field]:
+            self.coalesced += 1
+        else:
+            self._dirty[field] = 1
+            self._dirty_since[field] = now_ms
+
+    def due(self, now_ms: int, epoch_now: int) -> int:
+        """
+        Call regularly, returns REFRESH_NONE, REFRESH_PARTIAL or REFRESH_FULL.
+        The windows run on ticks_ms so setting the clock doesn't stall them,
+        the epoch time only decides when the daily budget starts over
+        """
+        day = epoch_now // epoch.SECONDS_PER_DAY
+        if day != self._day:
+            self._day = day
+            self.refreshes_today = 0
+
+        # highest priority field whose coalescing window is over
+        ready = -1
+        for field in range(N_FIELDS):
+            if (
+                self._dirty[field]
+                and utils.ticks_diff(now_ms, self._dirty_since[field])
+                >= self.window_ms[field]
+            ):
+                ready = field
+                break
+        if ready < 0:
+            return REFRESH_NONE
+
+        if self.refreshes_today >= self.daily_budget and ready != FIELD_ALARM:
+            if not self._held & _HELD_BUDGET:
+                self._held |= _HELD_BUDGET
+                self.deferred_budget += 1
+            return REFRESH_NONE
+        if self._last_refresh is not None:
+            if utils.ticks_diff(now_ms, self._last_refresh) < self.min_interval_ms:
+                if not self._held & _HELD_INTERVAL:
+                    self._held |= _HELD_INTERVAL
+                    self.deferred_interval += 1
+                return REFRESH_NONE
+
+        full = self._dirty[FIELD_DATE] or self._n_partial >= self.full_every
+        for field in range(N_FIELDS):
+            if self._dirty[field] and field != ready:
+                self.coalesced += 1
+            self._dirty[field] = 0
+        self._held = 0
+        self._last_refresh = now_ms
+        self.refreshes_today += 1
+        if full:
+            self._n_partial = 0
+            self.fulls += 1
+            return REFRESH_FULL
+        self._n_partial += 1
+        self.partials += 1
+        return REFRESH_PARTIAL
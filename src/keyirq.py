@@ -0,0 +1,48 @@
+import countio
+import digitalio
+
+from as1115 import AS1115
+
+
+class KeyIRQ:
+    """
+    Reads the AS1115 keyscan only when its IRQ pin reports a change
+    :param AS1115 as1115: The keyscan driver, poll() leaves the edges in
+        as1115.keys_pressed and as1115.keys_released
+    :param irq_pin: The AS1115 IRQ pin, active low, counted on falling edges
+    """
+
+    def __init__(self, as1115: AS1115, irq_pin):
+        self.as1115 = as1115
+        self.pin = irq_pin
+        self.claim()
+        # reading the keyscan releases the IRQ line in case it is already low
+        self.as1115.scan_keys()
+        self.irq.reset()
+        self._stale = False
+
+    def claim(self):
+        # take the pin, e.g. back from a sleep alarm
+        self.irq = countio.Counter(
+            self.pin, edge=countio.Edge.FALL, pull=digitalio.Pull.UP
+        )
+        # edges while the pin was released weren't counted
+        self._stale = True
+
+    def release(self):
+        # free the pin so it can be used as a sleep alarm
+        self.irq.deinit()
+
+    def pending(self) -> bool:
+        # the IRQ pin fired and hasn't been polled yet
+        return self._stale or self.irq.count > 0
+
+    def poll(self) -> bool:
+        # only touches the I2C bus if the IRQ pin fired since the last poll,
+        # returns True if any key went up or down
+        if not self.pending():
+            return False
+        self._stale = False
+        self.irq.reset()
+        self.as1115.scan_keys()
+        return bool(self.as1115.keys_pressed or self.as1115.keys_released)
@@ -1,29 +1,47 @@
-import time
+import alarm
+import asyncio
 import board
 import busio
+import supervisor
 
+import fsm as fsm_ids
 from fsm import FSM
+from ticker import Ticker
+from timers import Timers
+from idle import IdleSleep, idle_sleep_s
 import utils
 
 # hardware
 from batt import Batt
 from inkdisp import InkDisp
+import inkschedule
+from inkschedule import RefreshScheduler
 from clock import Clock
 from as1115 import AS1115
+from keyirq import KeyIRQ
+from events import EventQueue, KeyEvents, ON_RELEASE
 from encoder import Encoder
-from piezo import Piezo
-from button import PinButton, ScanButton
+from piezo import Piezo, ALARM_MELODY
+from button import PinButton
 from sense_ht import HTSensor
 from led import LED
 
+# keyscan bits, buttons physical order: 3, 4, 5, 6, 2, 1, 0
+KEY_SET_BRIGHTNESS = 1 << 2
+KEY_BACK = 1 << 3
+KEY_SET_DATE = 1 << 4
+KEY_SET_TIME = 1 << 5
+KEY_SET_ALARM = 1 << 6
+KEY_ENTER = 1 << 7
+
 # time.sleep(5)  # to ensure serial connection does not fail
 
 # initialize class objects
 i2c = busio.I2C(scl=board.GP5, sda=board.GP4)
-as1115 = AS1115(i2c)
-clock = Clock(i2c)
+as1115 = AS1115(i2c, auto_write=False)  # render_task sends the frames
+keys = KeyIRQ(as1115, board.GP11)
+clock = Clock(i2c, sqw_pin=board.GP3)  # time kept in RAM, paced by the RTC
 rf = PinButton(board.GP15)
-enc_button = ScanButton()
 battery = Batt(pin_vbatt=board.VOLTAGE_MONITOR, pin_usb=board.VBUS_SENSE)
 encoder = Encoder(pinA=board.GP1, pinB=board.GP0)
 buzzer = Piezo(board.GP2)
@@ -31,160 +49,449 @@ sensor = HTSensor(i2c)
 seg_colon = LED(board.GP13)  # segment display colon
 seg_apost = LED(board.GP12)  # segment display apostrophe
 seg_colon.on()
+# on battery the board light sleeps in the default state, keys, RF and the
+# encoder wake it
+sleeper = IdleSleep(alarm, (keys, rf, encoder))
 
-temp_str = sensor.get_temperature()
-humidity_str = sensor.get_humidity()
-date_str = clock.get_date_str()
-alarm_str = clock.get_alarm_str()
+temp_init, humidity_init = sensor.sample()
+battery.sample()  # so both histories start on the same sample
 inkdisp = InkDisp(
     cs=board.GP21,
     dc=board.GP22,
     reset=board.GP17,
-    date_init=date_str,
-    alarm_init=alarm_str,
-    temp_init=temp_str,
-    humidity_init=humidity_str,
+    busy=board.GP16,
+    date_init=clock.get_date_str(),
+    alarm_init=clock.get_alarm_str(),
+    temp_init=temp_init,
+    humidity_init=humidity_init,
     batt_init=battery.get_batt_frac(),
     usb_init=battery.usb_power.value,
 )
-clock.set_refresh()
 
-dt = 0.1
-beat_rate = 0.3
-k_beat = int(beat_rate / dt)
-k = 0
-heartbeat = True
+# task periods, ms
+period_fsm = 1000  # timer tick for the minute display, events wake the FSM early
+period_input = 10
+period_render = 50
+period_piezo = 10  # while a melody plays, sets the note timing resolution
+period_sensor = 60000
+spark_every = 18  # sensor periods per sparkline column, 80 columns = 24 h
+spark_entries = spark_every // sensor.history_every  # history entries per column
+period_eink = 1000
+period_eink_busy = 50
+beat_rate = 300  # ms per heartbeat half period
+snooze_min = 9
+
+# which half of the display winks
+WINK_LEFT = 1
+WINK_RIGHT = 2
+
+
+class Shared:
+    """
+    State passed between the tasks
+    """
+
+    def __init__(self):
+        self.events = EventQueue()  # filled by input_task, drained by fsm_task
+        self.wake = asyncio.Event()  # set by input_task to run the FSM early
+        self.wink = 0
+        self.temp = temp_init
+        self.humidity = humidity_init
+        self.input_ms = supervisor.ticks_ms()  # time of the most recent input
+        self.sparks_changed = False  # sensor_task drew new sparkline columns
+        self.timer_wake = asyncio.Event()  # a timer was armed, recheck the heap
+        self.snoozed = -1  # index of the snoozed alarm
+
 
+class Edit:
+    """
+    Values being set with the encoder, the originals and the new ones
+    """
+
+    def __init__(self):
+        self.year = self.month = self.day = 0
+        self.hour = self.minute = self.brightness = 0
+        self.year_new = self.month_new = self.day_new = 0
+        self.hour_new = self.min_new = 0
+
+
+shared = Shared()
+edit = Edit()
 fsm = FSM()
+timers = Timers()
+
+
+def snooze_over():
+    clock.ring(shared.snoozed)
+    shared.wake.set()  # let the FSM see the alarm now, not on its next tick
+
+
+T_SNOOZE = timers.add(snooze_over)
+
+
+def get_heartbeat() -> bool:
+    # derived from absolute time so the winking doesn't drift with task load
+    return (supervisor.ticks_ms() // beat_rate) % 2 == 0
+
+
+# key bitmask, event, long press event, flags
+KEYMAP = (
+    (KEY_ENTER, fsm_ids.EV_ENTER, fsm_ids.EV_NONE, ON_RELEASE),
+    (KEY_BACK, fsm_ids.EV_BACK, fsm_ids.EV_NONE, 0),
+    (KEY_SET_DATE, fsm_ids.EV_SET_DATE, fsm_ids.EV_NONE, 0),
+    (KEY_SET_TIME, fsm_ids.EV_SET_TIME, fsm_ids.EV_NONE, 0),
+    # tap to set the alarm, hold to turn it off
+    (KEY_SET_ALARM, fsm_ids.EV_SET_ALARM, fsm_ids.EV_NO_ALARM, ON_RELEASE),
+    (KEY_SET_BRIGHTNESS, fsm_ids.EV_SET_BRIGHTNESS, fsm_ids.EV_NONE, 0),
+)
+key_events = KeyEvents(shared.events, KEYMAP)
+
+
+async def input_task():
+    # keyscan is only read when the AS1115 IRQ fires, every edge becomes a
+    # timestamped event so a tap between two FSM ticks isn't lost
+    while True:
+        n_events = len(shared.events)
+        now = supervisor.ticks_ms()
+        if keys.poll():
+            key_events.update(as1115.keys_pressed, as1115.keys_released, now)
+        key_events.tick(now)
+        if rf.update():
+            shared.events.put(fsm_ids.EV_RF, now)
+        if encoder.moved():
+            shared.events.put(fsm_ids.EV_ENCODER, now)
+        if len(shared.events) != n_events:
+            shared.input_ms = now
+            shared.wake.set()
+        await asyncio.sleep(period_input / 1000)
+
+
+def run(event: int) -> None:
+    state = fsm.state
+    ACTIONS[fsm.execute(event)]()
+    if fsm.state != state:
+        # show the new state right away instead of on the next timer tick
+        ACTIONS[fsm.execute(fsm_ids.EV_NONE)]()
 
-while True:
-    if k >= k_beat:
-        k = 0
-        heartbeat = not heartbeat
-
-    buttons = as1115.scan_keys()
-
-    # buttons physical order
-    # 3, 4, 5, 6, 2, 1, 0
-    state = fsm.execute(
-        enter=enc_button.update(buttons[7]),
-        back=buttons[3],
-        set_date=buttons[4],
-        set_time=buttons[5],
-        set_alarm=buttons[6],
-        set_brightness=buttons[2],
-        alarm_status=clock.get_alarm_status(rf.update()),
+
+async def fsm_task():
+    ticker = Ticker(period_fsm)
+    alarm_status = False
+    while True:
+        clock.update()
+        # the alarm is an event source too, on its edges
+        status = clock.get_alarm_status()
+        if status != alarm_status:
+            alarm_status = status
+            event = fsm_ids.EV_ALARM if status else fsm_ids.EV_ALARM_OFF
+            shared.events.put(event, supervisor.ticks_ms())
+
+        event = shared.events.get()
+        if event == fsm_ids.EV_NONE:
+            run(fsm_ids.EV_NONE)  # timer tick
+        while event != fsm_ids.EV_NONE:
+            run(event)
+            event = shared.events.get()
+        seconds = idle_seconds()
+        if seconds:
+            # the digits are only sent by render_task, which won't run
+            # again before the sleep
+            as1115.show()
+            if sleeper.sleep(seconds):
+                shared.input_ms = supervisor.ticks_ms()
+            clock.resync()  # don't rely on edges being counted while asleep
+            ticker.restart()
+            # give input_task one poll to read the key or encoder that woke
+            # us before the next tick shows the new minute and decides again
+            await asyncio.sleep(period_input / 1000)
+            continue
+        await ticker.wait(wake=shared.wake)
+
+
+def idle_seconds() -> int:
+    alarm_in_s = None
+    if clock.get_epoch_alarm() >= 0:
+        alarm_in_s = clock.get_epoch_alarm() - clock.get_epoch_now()
+    # a pending timer counts as an alarm, e.g. the end of a snooze
+    timer_ms = timers.next_ms(supervisor.ticks_ms())
+    if timer_ms >= 0 and (alarm_in_s is None or timer_ms // 1000 < alarm_in_s):
+        alarm_in_s = timer_ms // 1000
+    return idle_sleep_s(
+        state=fsm.state,
+        usb=battery.usb_power.value,
+        busy=len(shared.events) > 0 or keys.pending() or inkdisp.busy,
+        sec=clock.now.tm_sec,
+        quiet_ms=utils.ticks_diff(supervisor.ticks_ms(), shared.input_ms),
+        alarm_in_s=alarm_in_s,
     )
-    print("state = ", state)
-
-    if state == "default":
-        seg_colon.on()
-        as1115.display_hourmin(clock.get_hour(), clock.get_min())
-    elif state in [
-        "start_set_month",
-        "start_set_day",
-        "start_set_min",
-        "start_set_alarm_min",
-    ]:
-        encoder.rezero()
-
-    elif state == "start_set_year":
-        seg_colon.off()
-        year = clock.get_year()
-        month = clock.get_month()
-        day = clock.get_day()
-        encoder.rezero()
-    elif state == "set_year":
-        year_new = utils.wrap_to_range(year + encoder.get_encoder_pos(), a=1970, b=2037)
-        as1115.display_int(year_new)
-        as1115.wink_left(heartbeat)
-        as1115.wink_right(heartbeat)
-    elif state == "set_month":
-        month_new = utils.wrap_to_range(month + encoder.get_encoder_pos(), a=1, b=12)
-        as1115.display_hourmin(month_new, day)
-        as1115.wink_left(heartbeat)
-    elif state == "set_day":
-        day_max = utils.get_max_day(year=year_new, month=month_new)
-        day_new = utils.wrap_to_range(day + encoder.get_encoder_pos(), a=1, b=day_max)
-        as1115.display_hourmin(month_new, day_new)
-        as1115.wink_right(heartbeat)
-    elif state == "end_set_day":
-        clock.set_date(year=year_new, month=month_new, day=day_new)
-        as1115.unwink()
-
-    elif state == "start_set_hour":
-        hour = clock.get_hour()
-        minute = clock.get_min()
-        encoder.rezero()
-    elif state == "set_hour":
-        hour_new = (hour + encoder.get_encoder_pos()) % 24
-        as1115.display_hourmin(hour_new, minute)
-        as1115.wink_left(heartbeat)
-    elif state == "set_min":
-        min_new = (minute + encoder.get_encoder_pos()) % 60
-        as1115.display_hourmin(hour_new, min_new)
-        as1115.wink_right(heartbeat)
-    elif state == "end_set_min":
-        clock.set_time(hour=hour_new, min=min_new)
-        as1115.unwink()
-
-    elif state == "start_set_alarm":
-        hour = clock.get_alarm_hour()
-        minute = clock.get_alarm_min()
-        encoder.rezero()
-    elif state == "set_alarm_hour":
-        hour_new = (hour + encoder.get_encoder_pos()) % 24
-        as1115.display_hourmin(hour_new, minute)
-        as1115.wink_left(heartbeat)
-    elif state == "set_alarm_min":
-        min_new = (minute + encoder.get_encoder_pos()) % 60
-        as1115.display_hourmin(hour_new, min_new)
-        as1115.wink_right(heartbeat)
-    elif state == "end_set_alarm_min":
-        clock.set_alarm(hour=hour_new, min=min_new)
-        as1115.unwink()
-
-    elif state == "set_no_alarm":
-        clock.disable_alarm()
-
-    elif state == "start_set_brightness":
-        seg_colon.off()
-        encoder.rezero()
-        brightness_new = as1115.brightness
-    elif state == "set_brightness":
-        as1115.brightness = (brightness_new + encoder.get_encoder_pos()) % 8
-        as1115.display_int(as1115.brightness)
-        seg_colon.set_brightness(as1115.brightness / 15)
-        seg_apost.set_brightness(as1115.brightness / 15)
-    elif state == "end_set_brightness":
-        pass
-
-    elif state == "alarming":
-        rf.update()
-        as1115.display_hourmin(clock.get_hour(), clock.get_min())
-        alarm_delta = clock.get_alarm_delta()
-        magnitude = utils.clip(abs(alarm_delta / clock.alarm_delta_max), 0.1, 1.0)
-        tone = 200  # utils.translate(utils.clip(magnitude, 0.1, 1.), 262, 464)
-        buzzer.play(tone=tone, amp=magnitude, on=heartbeat)
-    elif state == "end_alarming":
-        clock.reset_alarm()
+
+
+# action handlers, dispatched by the action index the FSM returns
+def do_default():
+    seg_colon.on()
+    shared.wink = 0
+    as1115.display_hourmin(clock.get_hour(), clock.get_min())
+
+
+def do_rezero():
+    encoder.rezero()
+
+
+def do_start_set_year():
+    seg_colon.off()
+    edit.year = clock.get_year()
+    edit.month = clock.get_month()
+    edit.day = clock.get_day()
+    encoder.rezero()
+
+
+def do_set_year():
+    edit.year_new = utils.wrap_to_range(
+        edit.year + encoder.get_encoder_pos(), a=1970, b=2037
+    )
+    as1115.display_int(edit.year_new)
+    shared.wink = WINK_LEFT | WINK_RIGHT
+
+
+def do_set_month():
+    edit.month_new = utils.wrap_to_range(
+        edit.month + encoder.get_encoder_pos(), a=1, b=12
+    )
+    as1115.display_hourmin(edit.month_new, edit.day)
+    shared.wink = WINK_LEFT
+
+
+def do_set_day():
+    day_max = utils.get_max_day(year=edit.year_new, month=edit.month_new)
+    edit.day_new = utils.wrap_to_range(
+        edit.day + encoder.get_encoder_pos(), a=1, b=day_max
+    )
+    as1115.display_hourmin(edit.month_new, edit.day_new)
+    shared.wink = WINK_RIGHT
+
+
+def do_end_set_day():
+    clock.set_date(year=edit.year_new, month=edit.month_new, day=edit.day_new)
+    shared.wink = 0
+
+
+def do_start_set_hour():
+    edit.hour = clock.get_hour()
+    edit.minute = clock.get_min()
+    encoder.rezero()
+
+
+def do_set_hour():
+    edit.hour_new = (edit.hour + encoder.get_encoder_pos()) % 24
+    as1115.display_hourmin(edit.hour_new, edit.minute)
+    shared.wink = WINK_LEFT
+
+
+def do_set_min():
+    edit.min_new = (edit.minute + encoder.get_encoder_pos()) % 60
+    as1115.display_hourmin(edit.hour_new, edit.min_new)
+    shared.wink = WINK_RIGHT
+
+
+def do_end_set_min():
+    clock.set_time(hour=edit.hour_new, min=edit.min_new)
+    shared.wink = 0
+
+
+def do_start_set_alarm():
+    edit.hour = clock.get_alarm_hour()
+    edit.minute = clock.get_alarm_min()
+    encoder.rezero()
+
+
+def do_end_set_alarm_min():
+    clock.set_alarm(hour=edit.hour_new, min=edit.min_new)
+    shared.wink = 0
+
+
+def do_set_no_alarm():
+    clock.disable_alarm()
+    timers.cancel(T_SNOOZE)
+
+
+def do_start_set_brightness():
+    seg_colon.off()
+    encoder.rezero()
+    edit.brightness = as1115.brightness
+
+
+def do_set_brightness():
+    as1115.brightness = (edit.brightness + encoder.get_encoder_pos()) % 8
+    as1115.display_int(as1115.brightness)
+    seg_colon.set_brightness(as1115.brightness / 15)
+    seg_apost.set_brightness(as1115.brightness / 15)
+
+
+def do_nothing():
+    pass
+
+
+def do_alarming():
+    as1115.display_hourmin(clock.get_hour(), clock.get_min())
+
+
+def do_end_alarming():
+    clock.reset_alarm()
+    buzzer.shutoff()
+    timers.cancel(T_SNOOZE)
+
+
+def do_snooze():
+    if clock.ringing_idx < 0:
+        # the alarm timed out or was reset on the same tick, nothing to snooze
         buzzer.shutoff()
+        return
+    shared.snoozed = clock.ringing_idx
+    clock.reset_alarm()
+    buzzer.shutoff()
+    timers.start(T_SNOOZE, snooze_min * 60000, supervisor.ticks_ms())
+    shared.timer_wake.set()
+
+
+# indexed by fsm.A_*
+ACTIONS = (
+    do_default,  # A_DEFAULT
+    do_alarming,  # A_ALARMING
+    do_end_alarming,  # A_END_ALARMING
+    do_start_set_year,  # A_START_SET_YEAR
+    do_set_year,  # A_SET_YEAR
+    do_rezero,  # A_START_SET_MONTH
+    do_set_month,  # A_SET_MONTH
+    do_rezero,  # A_START_SET_DAY
+    do_set_day,  # A_SET_DAY
+    do_end_set_day,  # A_END_SET_DAY
+    do_start_set_hour,  # A_START_SET_HOUR
+    do_set_hour,  # A_SET_HOUR
+    do_rezero,  # A_START_SET_MIN
+    do_set_min,  # A_SET_MIN
+    do_end_set_min,  # A_END_SET_MIN
+    do_start_set_alarm,  # A_START_SET_ALARM
+    do_set_hour,  # A_SET_ALARM_HOUR
+    do_rezero,  # A_START_SET_ALARM_MIN
+    do_set_min,  # A_SET_ALARM_MIN
+    do_end_set_alarm_min,  # A_END_SET_ALARM_MIN
+    do_set_no_alarm,  # A_SET_NO_ALARM
+    do_start_set_brightness,  # A_START_SET_BRIGHTNESS
+    do_set_brightness,  # A_SET_BRIGHTNESS
+    do_nothing,  # A_END_SET_BRIGHTNESS
+    do_nothing,  # A_SET_NO_BRIGHTNESS
+    do_snooze,  # A_SNOOZE
+)
+
+
+async def render_task():
+    # sends the 7-segment framebuffer and winks, independent of the FSM rate
+    while True:
+        heartbeat = get_heartbeat()
+        as1115.wink_left(heartbeat or not shared.wink & WINK_LEFT)
+        as1115.wink_right(heartbeat or not shared.wink & WINK_RIGHT)
+        as1115.show()
+        await asyncio.sleep(period_render / 1000)
+
 
-    # refresh inkdisp, make sure at least 3 minutes have passed before you refresh again
-    if (
-        date_str != clock.get_date_str() or alarm_str != clock.get_alarm_str()
-    ) and clock.get_refresh_delta() > 180:
-        date_str = clock.get_date_str()
-        alarm_str = clock.get_alarm_str()
-        inkdisp.clear()
-        inkdisp.apply_info(
-            date=date_str,
-            alarm=alarm_str,
-            batt=battery.get_batt_frac(),
-            usb=battery.usb_power.value,
+async def alarm_task():
+    # steps the alarm melody, gradual alarms crescendo over the ring time
+    while True:
+        now = supervisor.ticks_ms()
+        if fsm.state == fsm_ids.ALARMING:
+            if not buzzer.playing:
+                if clock.is_gradual():
+                    buzzer.start(
+                        ALARM_MELODY,
+                        now,
+                        loop=True,
+                        amp=0.1,
+                        ramp_ms=clock.alarm_delta_max * 1000,
+                    )
+                else:
+                    buzzer.start(ALARM_MELODY, now, loop=True)
+            buzzer.update(now)
+            await asyncio.sleep(period_piezo / 1000)
+        else:
+            if buzzer.playing:
+                buzzer.shutoff()
+            await asyncio.sleep(period_render / 1000)
+
+
+async def timer_task():
+    # sleeps until the next deadline, or until a new timer is armed
+    while True:
+        timers.run(supervisor.ticks_ms())
+        wait_ms = timers.next_ms(supervisor.ticks_ms())
+        try:
+            if wait_ms < 0:
+                await shared.timer_wake.wait()
+            else:
+                await asyncio.wait_for(shared.timer_wake.wait(), wait_ms / 1000)
+        except asyncio.TimeoutError:
+            pass
+        shared.timer_wake.clear()
+
+
+async def sensor_task():
+    n = 0
+    while True:
+        await asyncio.sleep(period_sensor / 1000)
+        shared.temp, shared.humidity = sensor.sample()
+        battery.sample()
+        n += 1
+        if n % spark_every == 0:
+            # each column is the mean of the history over its period
+            inkdisp.push_samples(
+                sensor.temp_history.mean_last(spark_entries) / 100,
+                sensor.humidity_history.mean_last(spark_entries) / 100,
+                battery.history.mean_last(spark_entries) / 100,
+            )
+            shared.sparks_changed = True
+
+
+async def eink_task():
+    scheduler = RefreshScheduler()
+    version = clock.version  # clock content the panel shows
+    while True:
+        # update the labels in place, the scheduler decides when they go out
+        now = supervisor.ticks_ms()
+        if version != clock.version:
+            version = clock.version
+            if inkdisp.set_alarm(clock.get_alarm_str()):
+                scheduler.mark(inkschedule.FIELD_ALARM, now)
+            if inkdisp.set_date(clock.get_date_str()):
+                scheduler.mark(inkschedule.FIELD_DATE, now)
+        if inkdisp.set_power(battery.get_batt_frac(), battery.usb_power.value):
+            scheduler.mark(inkschedule.FIELD_POWER, now)
+        env_changed = inkdisp.set_env(shared.temp, shared.humidity)
+        env_changed |= inkdisp.set_env_range(
+            sensor.get_temperature_stats(), sensor.get_humidity_stats()
         )
-        inkdisp.update()
-        clock.set_refresh()
+        if env_changed or shared.sparks_changed:
+            shared.sparks_changed = False
+            scheduler.mark(inkschedule.FIELD_ENV, now)
+        refresh = scheduler.due(now, clock.get_epoch_now())
+        if refresh != inkschedule.REFRESH_NONE:
+            inkdisp.request_refresh(full=refresh == inkschedule.REFRESH_FULL)
+        inkdisp.poll()
+        # poll quicker while the panel is busy so refresh timing is accurate
+        if inkdisp.busy:
+            await asyncio.sleep(period_eink_busy / 1000)
+        else:
+            await asyncio.sleep(period_eink / 1000)
+
+
+async def main():
+    await asyncio.gather(
+        asyncio.create_task(input_task()),
+        asyncio.create_task(fsm_task()),
+        asyncio.create_task(render_task()),
+        asyncio.create_task(alarm_task()),
+        asyncio.create_task(timer_task()),
+        asyncio.create_task(sensor_task()),
+        asyncio.create_task(eink_task()),
+    )
+
 
-    k += 1
-    time.sleep(dt)
+asyncio.run(main())
@@ -1,14 +1,60 @@
+from array import array
+
 import pwmio
 import utils
 
 
+def melody(*notes) -> array:
+    """
+    Compile notes into a flat array of (frequency Hz, duration ms) pairs
+    notes = (tone, ms) tuples, tone is a utils.tones name, a frequency in
+    Hz or None for a rest
+    """
+    table = array("H")
+    for tone, ms in notes:
+        if tone is None:
+            tone = 0
+        elif isinstance(tone, str):
+            tone = utils.tones[tone]
+        table.append(tone)
+        table.append(ms)
+    return table
+
+
+# rising arpeggio with a gap, loops while the alarm rings
+ALARM_MELODY = melody(
+    ("c4", 150),
+    ("e4", 150),
+    ("g4", 150),
+    ("c4", 150),
+    ("e4", 150),
+    ("g4", 300),
+    (None, 600),
+)
+
+
 class Piezo:
+    """
+    Buzzer with a melody sequencer. update() is called from a task and
+    steps through the notes on absolute deadlines, nothing blocks
+    """
+
     def __init__(self, pin):
-        self.buzzer = pwmio.PWMOut(pin, variable_frequency=False)
-        # self.buzzer = pwmio.PWMOut(pin, variable_frequency=True)
-        # self.duty_max = 2**16 - 1 # max duty cycle = 65535 Hz
+        self.buzzer = pwmio.PWMOut(
+            pin, frequency=440, duty_cycle=0, variable_frequency=True
+        )
         self.duty_min = 100
         self.duty_max = 4000
+        self.playing = False
+        self._melody = None
+        self._i = 0  # index of the current note's frequency in the table
+        self._loop = False
+        self._start_ms = 0
+        self._note_end_ms = 0
+        self._amp = 1.0
+        self._ramp_ms = 0
+        self._freq = 0
+        self.late_notes = 0  # notes skipped because update() came too late
 
     def play(self, tone: int, amp: float, on: bool):
         """
@@ -16,13 +62,73 @@ class Piezo:
         amp = amplitude, between 0 and 1
         """
         if on:
-            # self.buzzer.frequency = int(tone)
-            self.buzzer.duty_cycle = int(
-                utils.translate(amp, min=self.duty_min, max=self.duty_max)
-            )
-            print(self.buzzer.duty_cycle)
+            self.buzzer.frequency = int(tone)
+            self.buzzer.duty_cycle = self._duty(amp)
         else:
             self.buzzer.duty_cycle = 0
 
+    def _duty(self, amp: float) -> int:
+        return int(utils.translate(amp, min=self.duty_min, max=self.duty_max))
+
+    def start(
+        self,
+        melody: array,
+        now_ms: int,
+        loop: bool = False,
+        amp: float = 1.0,
+        ramp_ms: int = 0,
+    ):
+        """
+        Start a melody from a table made by melody()
+        amp = amplitude, between 0 and 1, where the volume ramp starts
+        ramp_ms = time to ramp linearly from amp to full volume, 0 for none
+        """
+        self._melody = melody
+        self._loop = loop
+        self._amp = amp
+        self._ramp_ms = ramp_ms
+        self._start_ms = now_ms
+        self._i = 0
+        self._note_end_ms = utils.ticks_add(now_ms, melody[1])
+        self.playing = True
+        self._sound(now_ms)
+
+    def update(self, now_ms: int) -> bool:
+        # call often, advances the melody and the ramp, returns True while playing
+        if not self.playing:
+            return False
+        melody = self._melody
+        advanced = False
+        while utils.ticks_diff(now_ms, self._note_end_ms) >= 0:
+            if advanced:
+                self.late_notes += 1
+            advanced = True
+            self._i += 2
+            if self._i >= len(melody):
+                if not self._loop:
+                    self.shutoff()
+                    return False
+                self._i = 0
+            # the next note starts when the last one was due to end, not
+            # when update() got round to it, so the tempo doesn't drift
+            self._note_end_ms = utils.ticks_add(self._note_end_ms, melody[self._i + 1])
+        self._sound(now_ms)
+        return True
+
+    def _sound(self, now_ms: int):
+        freq = self._melody[self._i]
+        if freq == 0:
+            self.buzzer.duty_cycle = 0
+            return
+        if freq != self._freq:
+            self.buzzer.frequency = freq
+            self._freq = freq
+        amp = self._amp
+        if self._ramp_ms:
+            elapsed = utils.ticks_diff(now_ms, self._start_ms)
+            amp += (1 - amp) * min(elapsed / self._ramp_ms, 1)
+        self.buzzer.duty_cycle = self._duty(amp)
+
     def shutoff(self):
+        self.playing = False
         self.buzzer.duty_cycle = 0
@@ -0,0 +1,98 @@
+from array import array
+
+
+class _Extreme:
+    """
+    Monotonic queue of ring indices, its front is the index of the
+    smallest (or largest) value in the window
+    """
+
+    def __init__(self, size: int, smallest: bool):
+        self.idx = array("H", [0] * size)
+        self.head = 0
+        self.n = 0
+        self.smallest = smallest
+
+    def push(self, values: array, i: int):
+        size = len(self.idx)
+        # i is about to be overwritten, drop it if it is still the front
+        if self.n and self.idx[self.head] == i:
+            self.head = (self.head + 1) % size
+            self.n -= 1
+        # values that can never be the extreme again leave from the back
+        value = values[i]
+        while self.n:
+            back = values[self.idx[(self.head + self.n - 1) % size]]
+            if (back < value) if self.smallest else (back > value):
+                break
+            self.n -= 1
+        self.idx[(self.head + self.n) % size] = i
+        self.n += 1
+
+    def front(self) -> int:
+        return self.idx[self.head]
+
+
+class RingStats:
+    """
+    Fixed size ring buffer of int16 samples with O(1) min, max and mean
+    over everything it holds, nothing is allocated after construction
+    :param int size: Samples kept, the oldest is overwritten first
+    """
+
+    def __init__(self, size: int):
+        self.values = array("h", [0] * size)
+        self.size = size
+        self.n = 0  # samples held
+        self.next = 0  # where the next sample goes
+        self.total = 0
+        self._min = _Extreme(size, smallest=True)
+        self._max = _Extreme(size, smallest=False)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def push(self, value: int):
+        i = self.next
+        if self.n == self.size:
+            self.total -= self.values[i]
+        else:
+            self.n += 1
+        self.values[i] = value
+        self.total += value
+        self._min.push(self.values, i)
+        self._max.push(self.values, i)
+        self.next = (i + 1) % self.size
+
+    def get(self, k: int) -> int:
+        # k = 0 is the oldest sample held
+        return self.values[(self.next - self.n + k) % self.size]
+
+    def latest(self) -> int:
+        return self.values[(self.next - 1) % self.size]
+
+    # min, max and mean are None while nothing has been pushed
+    def min(self) -> int:
+        if not self.n:
+            return None
+        return self.values[self._min.front()]
+
+    def max(self) -> int:
+        if not self.n:
+            return None
+        return self.values[self._max.front()]
+
+    def mean(self) -> float:
+        if not self.n:
+            return None
+        return self.total / self.n
+
+    def mean_last(self, k: int) -> float:
+        # mean of the newest k samples, or of all of them if there are fewer
+        k = min(k, self.n)
+        if not k:
+            return None
+        total = 0
+        for i in range(self.n - k, self.n):
+            total += self.get(i)
+        return total / k
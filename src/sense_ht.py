@@ -1,10 +1,36 @@
 import adafruit_sht4x
+import supervisor
 from busio import I2C
 
+import utils
+from ring import RingStats
+
+# history, one entry per history_every samples
+HISTORY_SIZE = 240  # 24 h of 6 minute entries
+
 
 class HTSensor:
-    def __init__(self, i2c: I2C):
+    """
+    SHT4x temperature and humidity, both from one measurement
+    :param int ttl_ms: How long a measurement is reused before the sensor
+        is read again
+    :param int history_every: Samples per history entry, with one sample a
+        minute the default keeps 6 minute entries
+    """
+
+    def __init__(self, i2c: I2C, ttl_ms: int = 30000, history_every: int = 6):
         self.sht = adafruit_sht4x.SHT4x(i2c)
+        self.ttl_ms = ttl_ms
+        self.history_every = history_every
+        self.reads = 0  # measurements taken on the bus
+        self._read_ms = 0
+        self._n_samples = 0
+        self.temp = 0.0
+        self.humidity = 0.0
+        # fixed point, 0.01 °C and 0.01 %RH
+        self.temp_history = RingStats(HISTORY_SIZE)
+        self.humidity_history = RingStats(HISTORY_SIZE)
+        self.measure(force=True)
 
     def set_mode_read(self):
         self.sht.mode = adafruit_sht4x.Mode.NOHEAT_HIGHPRECISION
@@ -12,8 +38,40 @@ class HTSensor:
     def set_mode_heat(self):
         self.sht.mode = adafruit_sht4x.Mode.LOWHEAT_100MS
 
-    def get_temperature(self):
-        return self.sht.temperature
+    def measure(self, force: bool = False) -> tuple:
+        # one conversion gives both values, reused until ttl_ms has passed
+        now = supervisor.ticks_ms()
+        if force or utils.ticks_diff(now, self._read_ms) >= self.ttl_ms:
+            self.temp, self.humidity = self.sht.measurements
+            self._read_ms = now
+            self.reads += 1
+        return self.temp, self.humidity
+
+    def sample(self) -> tuple:
+        # call once per sample period, every history_every'th goes in the history
+        temp, humidity = self.measure()
+        if self._n_samples % self.history_every == 0:
+            self.temp_history.push(round(temp * 100))
+            self.humidity_history.push(round(humidity * 100))
+        self._n_samples += 1
+        return temp, humidity
+
+    def get_temperature(self) -> float:
+        return self.measure()[0]
+
+    def get_humidity(self) -> float:
+        return self.measure()[1]
+
+    def get_temperature_stats(self) -> tuple:
+        # (min, max, mean) °C over the history, None before the first sample
+        return _stats(self.temp_history)
+
+    def get_humidity_stats(self) -> tuple:
+        # (min, max, mean) %RH over the history, None before the first sample
+        return _stats(self.humidity_history)
+
 
-    def get_humidity(self):
-        return self.sht.relative_humidity
+def _stats(h: RingStats) -> tuple:
+    if not h:
+        return None
+    return h.min() / 100, h.max() / 100, h.mean() / 100
@@ -0,0 +1,49 @@
+class Sparkline:
+    """
+    Scrolling graph kept in one bitmap that is never reallocated. Every
+    bitmap column is its own tile, so scrolling by one only renumbers the
+    tiles and the new sample is drawn into the column that scrolled off
+    :param bitmap: 2 color bitmap, width x height, set with bitmap[x, y]
+    :param tiles: One tile index per screen column, e.g. a TileGrid with
+        tile_width=1 over the bitmap
+    :param float lo: Value drawn on the bottom row, lower values are clipped
+    :param float hi: Value drawn on the top row, higher values are clipped
+    """
+
+    def __init__(self, bitmap, tiles, x: int, y: int, width: int, height: int, lo, hi):
+        self.bitmap = bitmap
+        self.tiles = tiles
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.lo = lo
+        self.hi = hi
+        self.head = 0  # bitmap column of the oldest sample
+        self._last_row = -1
+        self._scroll()
+
+    def _row(self, value) -> int:
+        frac = (value - self.lo) / (self.hi - self.lo)
+        row = round((1 - frac) * (self.height - 1))
+        return min(max(row, 0), self.height - 1)
+
+    def push(self, value):
+        # draws one column and scrolls the graph left by one
+        col = self.head
+        bitmap = self.bitmap
+        for r in range(self.height):
+            bitmap[col, r] = 0
+        row = self._row(value)
+        # join up with the previous sample so steps stay visible
+        last = row if self._last_row < 0 else self._last_row
+        for r in range(min(row, last), max(row, last) + 1):
+            bitmap[col, r] = 1
+        self._last_row = row
+        self.head = (col + 1) % self.width
+        self._scroll()
+
+    def _scroll(self):
+        # oldest on the left, newest on the right
+        for i in range(self.width):
+            self.tiles[i] = (self.head + i) % self.width
@@ -0,0 +1,46 @@
+import asyncio
+import supervisor
+
+import utils
+
+
+class Ticker:
+    """
+    Paces an asyncio task on absolute deadlines, so time spent working
+    doesn't stretch the period
+    """
+
+    def __init__(self, period_ms: int):
+        self.period_ms = period_ms
+        self.deadline = supervisor.ticks_ms()
+        self.overruns = 0  # deadlines that had already passed when wait() ran
+        self.late_ms = 0  # how late the most recent overrun was
+
+    def restart(self) -> None:
+        # start the period over from now, e.g. after the board slept
+        self.deadline = supervisor.ticks_ms()
+
+    async def wait(self, wake: asyncio.Event = None) -> None:
+        """
+        Sleep until the next deadline
+        wake = optional event, setting it ends the wait early and restarts
+        the period from now
+        """
+        self.deadline = utils.ticks_add(self.deadline, self.period_ms)
+        remaining = utils.ticks_diff(self.deadline, supervisor.ticks_ms())
+        if remaining < 0:
+            # overran, start over from now instead of trying to catch up
+            self.overruns += 1
+            self.late_ms = -remaining
+            self.restart()
+            await asyncio.sleep(0)  # still let the other tasks run
+            return
+        if wake is None:
+            await asyncio.sleep(remaining / 1000)
+            return
+        try:
+            await asyncio.wait_for(wake.wait(), remaining / 1000)
+        except asyncio.TimeoutError:
+            return
+        wake.clear()
+        self.restart()
@@ -0,0 +1,115 @@
+from array import array
+
+import utils
+
+
+class Timers:
+    """
+    One-shot and periodic timers on supervisor.ticks_ms, due times are
+    kept in a binary min-heap so finding the next one is O(1). Deadlines
+    are compared with ticks_diff, so they wrap correctly as long as none is
+    more than half a tick period (about 3 days) away
+    :param int size: Maximum number of timers
+    """
+
+    def __init__(self, size: int = 8):
+        self.size = size
+        self._callbacks = []
+        self._period = array("l", [0] * size)  # ms, 0 for one-shot
+        self._deadline = array("l", [0] * size)
+        self._pos = array("b", [-1] * size)  # heap position of each timer, -1 = idle
+        self._heap = bytearray(size)  # timer ids ordered by deadline
+        self._n = 0
+        self.fired = 0
+
+    def add(self, callback) -> int:
+        # register a callback, returns the timer id used by start and cancel
+        if len(self._callbacks) == self.size:
+            raise RuntimeError("No free timers")
+        self._callbacks.append(callback)
+        return len(self._callbacks) - 1
+
+    def start(self, timer: int, delay_ms: int, now_ms: int, period_ms: int = 0):
+        # (re)arm a timer to fire delay_ms from now, then every period_ms if set
+        self.cancel(timer)
+        self._period[timer] = period_ms
+        self._deadline[timer] = utils.ticks_add(now_ms, delay_ms)
+        self._push(timer)
+
+    def cancel(self, timer: int):
+        pos = self._pos[timer]
+        if pos < 0:
+            return
+        self._n -= 1
+        last = self._heap[self._n]
+        self._pos[timer] = -1
+        if pos == self._n:
+            return
+        self._heap[pos] = last
+        self._pos[last] = pos
+        self._sift_up(pos)
+        self._sift_down(self._pos[last])
+
+    def active(self, timer: int) -> bool:
+        return self._pos[timer] >= 0
+
+    def next_ms(self, now_ms: int) -> int:
+        # time until the next deadline, 0 if one is due, -1 if none is armed
+        if self._n == 0:
+            return -1
+        return max(utils.ticks_diff(self._deadline[self._heap[0]], now_ms), 0)
+
+    def run(self, now_ms: int) -> int:
+        # fire every due timer, returns how many fired
+        n = 0
+        while self._n and utils.ticks_diff(now_ms, self._deadline[self._heap[0]]) >= 0:
+            timer = self._heap[0]
+            self.cancel(timer)
+            if self._period[timer]:
+                # from the deadline, not from now, so periodic timers don't drift
+                self._deadline[timer] = utils.ticks_add(
+                    self._deadline[timer], self._period[timer]
+                )
+                self._push(timer)
+            n += 1
+            self._callbacks[timer]()
+        self.fired += n
+        return n
+
+    def _before(self, a: int, b: int) -> bool:
+        return utils.ticks_diff(self._deadline[a], self._deadline[b]) < 0
+
+    def _push(self, timer: int):
+        self._heap[self._n] = timer
+        self._pos[timer] = self._n
+        self._n += 1
+        self._sift_up(self._n - 1)
+
+    def _swap(self, i: int, j: int):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i]] = i
+        self._pos[heap[j]] = j
+
+    def _sift_up(self, i: int):
+        heap = self._heap
+        while i:
+            parent = (i - 1) >> 1
+            if not self._before(heap[i], heap[parent]):
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int):
+        heap = self._heap
+        n = self._n
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and self._before(heap[child + 1], heap[child]):
+                child += 1
+            if not self._before(heap[child], heap[i]):
+                break
+            self._swap(i, child)
+            i = child
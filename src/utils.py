@@ -111,3 +111,20 @@ def get_wday(year: int, month: int, day: int) -> int:
     c = int(str(year_shifted)[0:2])  # century
     y = int(str(year_shifted)[2:4])  # year of century
     return (day + (2.6 * month_shifted - 0.2) - 2 * c + y + y / 4 + c / 4) % 7
+
+
+# supervisor.ticks_ms() wraps around every 2**29 ms
+TICKS_PERIOD = 1 << 29
+TICKS_MAX = TICKS_PERIOD - 1
+TICKS_HALFPERIOD = TICKS_PERIOD // 2
+
+
+def ticks_add(ticks: int, delta: int) -> int:
+    # add a delta in ms to a ticks_ms() value
+    return (ticks + delta) & TICKS_MAX
+
+
+def ticks_diff(ticks1: int, ticks2: int) -> int:
+    # signed difference ticks1 - ticks2 in ms, valid across wraparound
+    diff = (ticks1 - ticks2) & TICKS_MAX
+    return ((diff + TICKS_HALFPERIOD) & TICKS_MAX) - TICKS_HALFPERIOD
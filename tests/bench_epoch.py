@@ -0,0 +1,58 @@
+"""
+Host benchmark of one Clock tick's time math, the adafruit_datetime code
+Clock used before against the integer epoch helpers it uses now
+
+pip install adafruit-circuitpython-datetime
+python tests/bench_epoch.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+)
+
+import adafruit_datetime
+import epoch
+
+N = 20000
+
+
+def old_tick(t: time.struct_time, hour: int, minute: int, refresh) -> tuple:
+    # get_alarm_delta() and get_refresh_delta() as the baseline Clock did them
+    now = adafruit_datetime.datetime.fromtimestamp(time.mktime(t))
+    alarm = now.replace(hour=hour, minute=minute, second=0)
+    now = adafruit_datetime.datetime.fromtimestamp(time.mktime(t))
+    alarm_delta = (now - alarm).total_seconds()
+    now = adafruit_datetime.datetime.fromtimestamp(time.mktime(t))
+    refresh_delta = (now - refresh).total_seconds()
+    return alarm_delta, refresh_delta
+
+
+def new_tick(t: time.struct_time, hour: int, minute: int, refresh: int) -> tuple:
+    now = epoch.to_epoch(t)
+    alarm = now - now % epoch.SECONDS_PER_DAY + epoch.seconds_of_day(hour, minute)
+    return now - alarm, now - refresh
+
+
+def bench(name: str, tick, refresh) -> float:
+    times = [epoch.to_struct_time(946684800 + 37 * i) for i in range(N)]
+    start = time.perf_counter()
+    for t in times:
+        tick(t, 7, 30, refresh)
+    us = (time.perf_counter() - start) / N * 1e6
+    print("{:>16}: {:8.2f} us/tick".format(name, us))
+    return us
+
+
+if __name__ == "__main__":
+    t0 = epoch.to_struct_time(946684800)
+    old = bench(
+        "adafruit_datetime",
+        old_tick,
+        adafruit_datetime.datetime.fromtimestamp(time.mktime(t0)),
+    )
+    new = bench("epoch", new_tick, epoch.to_epoch(t0))
+    print("{:>16}: {:8.1f}x".format("speedup", old / new))
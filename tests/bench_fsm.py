@@ -0,0 +1,115 @@
+"""
+Host benchmark of FSM ticks per second, the string based FSM with main's
+if/elif dispatch against the table driven FSM with the ACTIONS tuple
+
+python tests/bench_fsm.py
+"""
+
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+
+import fsm as fsm_ids
+import fsm_strings
+from fsm import FSM
+
+N = 200000
+
+# a minute of idle ticks, then an alarm edit and a ringing alarm
+SCRIPT = (
+    [fsm_ids.EV_NONE] * 60
+    + [fsm_ids.EV_SET_ALARM, fsm_ids.EV_NONE, fsm_ids.EV_ENCODER]
+    + [fsm_ids.EV_ENTER, fsm_ids.EV_NONE, fsm_ids.EV_ENTER]
+    + [fsm_ids.EV_ALARM] * 10
+    + [fsm_ids.EV_ALARM_OFF]
+)
+
+# the old execute() took one flag per input, in this order
+OLD_FLAGS = {
+    fsm_ids.EV_ENTER: 0,
+    fsm_ids.EV_BACK: 1,
+    fsm_ids.EV_SET_DATE: 2,
+    fsm_ids.EV_SET_TIME: 3,
+    fsm_ids.EV_SET_ALARM: 4,
+    fsm_ids.EV_SET_BRIGHTNESS: 5,
+}
+
+# baseline main compared the returned string in this order
+OLD_OUTPUTS = (
+    "default",
+    "start_set_year",
+    "set_year",
+    "set_month",
+    "set_day",
+    "end_set_day",
+    "start_set_hour",
+    "set_hour",
+    "set_min",
+    "end_set_min",
+    "start_set_alarm",
+    "set_alarm_hour",
+    "set_alarm_min",
+    "end_set_alarm_min",
+    "set_no_alarm",
+    "start_set_brightness",
+    "set_brightness",
+    "end_set_brightness",
+    "alarming",
+    "end_alarming",
+)
+
+
+def old_inputs() -> list:
+    # the old FSM sampled levels, so the alarm stays on between its events
+    inputs = []
+    ringing = False
+    for event in SCRIPT:
+        flags = [False] * 7
+        if event in OLD_FLAGS:
+            flags[OLD_FLAGS[event]] = True
+        ringing = event == fsm_ids.EV_ALARM or (
+            ringing and event != fsm_ids.EV_ALARM_OFF
+        )
+        flags[6] = ringing
+        inputs.append(tuple(flags))
+    return inputs
+
+
+def noop():
+    pass
+
+
+def bench_old() -> float:
+    fsm = fsm_strings.FSM()
+    inputs = old_inputs()
+    n_inputs = len(inputs)
+    start = time.perf_counter()
+    for i in range(N):
+        output = fsm.execute(*inputs[i % n_inputs])
+        # stands in for the if/elif chain over the returned string
+        for name in OLD_OUTPUTS:
+            if output == name:
+                noop()
+                break
+    return N / (time.perf_counter() - start)
+
+
+def bench_new() -> float:
+    fsm = FSM()
+    actions = (noop,) * fsm_ids.N_ACTIONS
+    n_script = len(SCRIPT)
+    start = time.perf_counter()
+    for i in range(N):
+        actions[fsm.execute(SCRIPT[i % n_script])]()
+    return N / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    old = bench_old()
+    new = bench_new()
+    print("{:>8}: {:10.0f} ticks/s".format("strings", old))
+    print("{:>8}: {:10.0f} ticks/s".format("table", new))
+    print("{:>8}: {:10.1f}x".format("speedup", new / old))
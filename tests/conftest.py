@@ -0,0 +1,12 @@
+"""
+Host tests for the firmware in src/, run with plain CPython and pytest.
+Hardware modules the firmware imports are replaced by the fakes in
+tests/fakes, which are put ahead of site-packages on sys.path
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+sys.path.insert(0, os.path.join(HERE, "fakes"))
@@ -0,0 +1,38 @@
+"""
+Fake I2CDevice on the fake busio.I2C, the first byte written is the
+register address like on the chips in this project
+"""
+
+
+class I2CDevice:
+    def __init__(self, i2c, device_address: int, probe: bool = True):
+        self.i2c = i2c
+        self.device_address = device_address
+        i2c.device(device_address)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write(self, buf, *, start: int = 0, end: int = None) -> None:
+        data = bytes(buf[start:end])
+        self.i2c.write(self.device_address, data[0], data[1:])
+
+    def write_then_readinto(
+        self,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start: int = 0,
+        out_end: int = None,
+        in_start: int = 0,
+        in_end: int = None
+    ) -> None:
+        if in_end is None:
+            in_end = len(in_buffer)
+        register = out_buffer[out_start]
+        in_buffer[in_start:in_end] = self.i2c.read(
+            self.device_address, register, in_end - in_start
+        )
@@ -0,0 +1,8 @@
+class Label:
+    def __init__(self, font, *, text: str = "", color=0xFFFFFF, scale: int = 1):
+        self.font = font
+        self.text = text
+        self.color = color
+        self.scale = scale
+        self.anchor_point = (0, 0)
+        self.anchored_position = (0, 0)
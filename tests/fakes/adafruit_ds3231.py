@@ -0,0 +1,119 @@
+"""
+Fake DS3231 driver on the fake busio.I2C, the registers use the chip's
+BCD layout and each property access is one transaction like the real one
+"""
+
+import time
+
+from adafruit_bus_device.i2c_device import I2CDevice
+
+ADDRESS = 0x68
+
+
+def _bcd2bin(value: int) -> int:
+    return value - 6 * (value >> 4)
+
+
+def _bin2bcd(value: int) -> int:
+    return value + 6 * (value // 10)
+
+
+class DS3231:
+    def __init__(self, i2c):
+        self.i2c_device = I2CDevice(i2c, ADDRESS)
+        self._buffer = bytearray(8)
+
+    def _read(self, register: int, n: int) -> bytearray:
+        self._buffer[0] = register
+        with self.i2c_device as i2c:
+            i2c.write_then_readinto(
+                self._buffer, self._buffer, out_end=1, in_start=1, in_end=n + 1
+            )
+        return self._buffer[1 : n + 1]
+
+    def _write(self, register: int, data) -> None:
+        with self.i2c_device as i2c:
+            i2c.write(bytes((register,)) + bytes(data))
+
+    @property
+    def datetime(self) -> time.struct_time:
+        b = self._read(0x00, 7)
+        return time.struct_time(
+            (
+                2000 + _bcd2bin(b[6]),
+                _bcd2bin(b[5] & 0x1F),
+                _bcd2bin(b[4]),
+                _bcd2bin(b[2]),
+                _bcd2bin(b[1]),
+                _bcd2bin(b[0] & 0x7F),
+                b[3] - 1,
+                -1,
+                -1,
+            )
+        )
+
+    @datetime.setter
+    def datetime(self, t: time.struct_time) -> None:
+        # a bytearray only takes ints, like the real driver's buffer
+        self._write(
+            0x00,
+            bytearray(
+                (
+                    _bin2bcd(t.tm_sec),
+                    _bin2bcd(t.tm_min),
+                    _bin2bcd(t.tm_hour),
+                    t.tm_wday + 1,
+                    _bin2bcd(t.tm_mday),
+                    _bin2bcd(t.tm_mon),
+                    _bin2bcd(t.tm_year - 2000),
+                )
+            ),
+        )
+
+    def _get_alarm(self, register: int, has_seconds: bool) -> tuple:
+        b = self._read(register, 4 if has_seconds else 3)
+        if not has_seconds:
+            b = bytearray(1) + b
+        mday = _bcd2bin(b[3] & 0x3F)
+        t = time.struct_time(
+            (
+                2017,
+                1,
+                mday,
+                _bcd2bin(b[2] & 0x7F),
+                _bcd2bin(b[1] & 0x7F),
+                _bcd2bin(b[0] & 0x7F),
+                (mday - 2) % 7,
+                mday,
+                -1,
+            )
+        )
+        return t, "monthly"
+
+    def _set_alarm(self, register: int, has_seconds: bool, value: tuple) -> None:
+        t, _ = value
+        data = bytearray(
+            (
+                _bin2bcd(t.tm_sec),
+                _bin2bcd(t.tm_min),
+                _bin2bcd(t.tm_hour),
+                _bin2bcd(t.tm_mday),
+            )
+        )
+        self._write(register, data if has_seconds else data[1:])
+
+    @property
+    def alarm1(self) -> tuple:
+        return self._get_alarm(0x07, True)
+
+    @alarm1.setter
+    def alarm1(self, value: tuple) -> None:
+        self._set_alarm(0x07, True, value)
+
+    @property
+    def alarm2(self) -> tuple:
+        return self._get_alarm(0x0B, False)
+
+    @alarm2.setter
+    def alarm2(self, value: tuple) -> None:
+        self._set_alarm(0x0B, False, value)
@@ -0,0 +1,21 @@
+from adafruit_register.i2c_bits import ROBits, RWBits
+
+
+class ROBit(ROBits):
+    def __init__(self, register_address: int, bit: int, **kwargs):
+        super().__init__(1, register_address, bit)
+
+    def __get__(self, obj, objtype=None) -> bool:
+        if obj is None:
+            return self
+        return bool(super().__get__(obj, objtype))
+
+
+class RWBit(RWBits):
+    def __init__(self, register_address: int, bit: int, **kwargs):
+        super().__init__(1, register_address, bit)
+
+    def __get__(self, obj, objtype=None) -> bool:
+        if obj is None:
+            return self
+        return bool(super().__get__(obj, objtype))
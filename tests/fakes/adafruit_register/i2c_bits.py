@@ -0,0 +1,31 @@
+"""
+Fake RWBits and ROBits on the fake I2CDevice, a set is a read then a
+write like the real one
+"""
+
+
+class ROBits:
+    def __init__(self, num_bits: int, register_address: int, lowest_bit: int, **kwargs):
+        self.mask = ((1 << num_bits) - 1) << lowest_bit
+        self.address = register_address
+        self.lowest_bit = lowest_bit
+        self.buffer = bytearray(2)
+
+    def _read(self, obj) -> int:
+        self.buffer[0] = self.address
+        with obj.i2c_device as i2c:
+            i2c.write_then_readinto(self.buffer, self.buffer, out_end=1, in_start=1)
+        return self.buffer[1]
+
+    def __get__(self, obj, objtype=None) -> int:
+        if obj is None:
+            return self
+        return (self._read(obj) & self.mask) >> self.lowest_bit
+
+
+class RWBits(ROBits):
+    def __set__(self, obj, value: int) -> None:
+        reg = self._read(obj) & ~self.mask
+        self.buffer[1] = reg | ((int(value) << self.lowest_bit) & self.mask)
+        with obj.i2c_device as i2c:
+            i2c.write(self.buffer)
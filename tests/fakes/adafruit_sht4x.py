@@ -0,0 +1,9 @@
+class Mode:
+    NOHEAT_HIGHPRECISION = 0
+    LOWHEAT_100MS = 1
+
+
+class SHT4x:
+    def __init__(self, i2c, address: int = 0x44):
+        self.mode = Mode.NOHEAT_HIGHPRECISION
+        self.measurements = (21.5, 40.0)
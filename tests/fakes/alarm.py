@@ -0,0 +1,32 @@
+"""
+Fake alarm, light sleep returns right away as if the time alarm fired,
+or the pin alarm on WAKE_PIN if it is set. The alarms of every sleep are
+kept in sleeps
+"""
+
+import types
+
+WAKE_PIN = None
+sleeps = []
+
+
+class TimeAlarm:
+    def __init__(self, *, monotonic_time: float = None, epoch_time: int = None):
+        self.monotonic_time = monotonic_time
+
+
+class PinAlarm:
+    def __init__(self, pin, value: bool, edge: bool = False, pull: bool = False):
+        self.pin = pin
+
+
+time = types.SimpleNamespace(TimeAlarm=TimeAlarm)
+pin = types.SimpleNamespace(PinAlarm=PinAlarm)
+
+
+def light_sleep_until_alarms(*alarms):
+    sleeps.append(alarms)
+    for a in alarms:
+        if isinstance(a, PinAlarm) and a.pin is WAKE_PIN:
+            return a
+    return alarms[0]
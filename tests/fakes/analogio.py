@@ -0,0 +1,6 @@
+class AnalogIn:
+    def __init__(self, pin):
+        self.value = 40000  # about 2 V at the pin
+
+    def deinit(self) -> None:
+        pass
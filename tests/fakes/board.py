@@ -0,0 +1,9 @@
+"""
+Fake board, every pin is its name
+"""
+
+
+def __getattr__(name: str) -> str:
+    if name.startswith("GP") or name.isupper():
+        return name
+    raise AttributeError(name)
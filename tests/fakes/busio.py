@@ -0,0 +1,34 @@
+"""
+Fake busio. I2C keeps a 256 byte register file for each device address
+and counts transactions, a burst read or write of any length is one
+"""
+
+# address: {register: value}, what a device's registers hold at power on
+RESET_VALUES = {}
+
+
+class I2C:
+    def __init__(self, scl=None, sda=None, frequency: int = 100000):
+        self.transactions = 0
+        self.regs = {}  # address: bytearray
+
+    def device(self, address: int) -> bytearray:
+        if address not in self.regs:
+            regs = bytearray(256)
+            for register, value in RESET_VALUES.get(address, {}).items():
+                regs[register] = value
+            self.regs[address] = regs
+        return self.regs[address]
+
+    def read(self, address: int, register: int, n: int) -> bytearray:
+        self.transactions += 1
+        return self.device(address)[register : register + n]
+
+    def write(self, address: int, register: int, data) -> None:
+        self.transactions += 1
+        self.device(address)[register : register + len(data)] = bytes(data)
+
+
+class SPI:
+    def __init__(self, clock=None, MOSI=None, MISO=None):
+        pass
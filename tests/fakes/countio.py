@@ -0,0 +1,25 @@
+"""
+Fake countio, a test finds the counter on a pin in COUNTERS and bumps it
+"""
+
+COUNTERS = {}  # pin: the Counter that has it
+
+
+class Edge:
+    RISE = 0
+    FALL = 1
+    RISE_AND_FALL = 2
+
+
+class Counter:
+    def __init__(self, pin, *, edge: int = Edge.FALL, pull=None):
+        self.pin = pin
+        self.count = 0
+        COUNTERS[pin] = self
+
+    def reset(self) -> None:
+        self.count = 0
+
+    def deinit(self) -> None:
+        if COUNTERS.get(self.pin) is self:
+            del COUNTERS[self.pin]
@@ -0,0 +1,36 @@
+"""
+Fake digitalio, a test sets an input with VALUES[pin]
+"""
+
+VALUES = {}  # pin: level read by inputs
+
+
+class Direction:
+    INPUT = 0
+    OUTPUT = 1
+
+
+class Pull:
+    UP = 1
+    DOWN = 2
+
+
+class DigitalInOut:
+    def __init__(self, pin):
+        self.pin = pin
+        self.direction = Direction.INPUT
+        self.pull = None
+        self._value = False
+
+    @property
+    def value(self) -> bool:
+        if self.direction == Direction.INPUT:
+            return VALUES.get(self.pin, self.pull == Pull.UP)
+        return self._value
+
+    @value.setter
+    def value(self, value: bool) -> None:
+        self._value = value
+
+    def deinit(self) -> None:
+        pass
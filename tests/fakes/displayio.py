@@ -0,0 +1,67 @@
+"""
+Fake displayio, enough of the object model for InkDisp
+"""
+
+from epaperdisplay import EPaperDisplay
+from fourwire import FourWire
+
+
+def release_displays() -> None:
+    pass
+
+
+class Group(list):
+    def __init__(self, *, scale: int = 1, x: int = 0, y: int = 0):
+        super().__init__()
+
+
+class Palette(list):
+    def __init__(self, color_count: int):
+        super().__init__([0] * color_count)
+
+
+class Bitmap:
+    def __init__(self, width: int, height: int, value_count: int):
+        self.width = width
+        self.height = height
+        self._pixels = bytearray(width * height)
+
+    def __getitem__(self, xy: tuple) -> int:
+        x, y = xy
+        return self._pixels[y * self.width + x]
+
+    def __setitem__(self, xy: tuple, value: int) -> None:
+        x, y = xy
+        self._pixels[y * self.width + x] = value
+
+
+class TileGrid:
+    def __init__(
+        self,
+        bitmap,
+        *,
+        pixel_shader,
+        width: int = 1,
+        height: int = 1,
+        tile_width: int = None,
+        tile_height: int = None,
+        default_tile: int = 0,
+        x: int = 0,
+        y: int = 0
+    ):
+        self.bitmap = bitmap
+        self.width = width
+        self.height = height
+        self.x = x
+        self.y = y
+        self._tiles = [default_tile] * (width * height)
+
+    def __getitem__(self, index) -> int:
+        if isinstance(index, tuple):
+            index = index[1] * self.width + index[0]
+        return self._tiles[index]
+
+    def __setitem__(self, index, value: int) -> None:
+        if isinstance(index, tuple):
+            index = index[1] * self.width + index[0]
+        self._tiles[index] = value
@@ -0,0 +1,48 @@
+"""
+Fake EPaperDisplay. A refresh keeps the panel busy for REFRESH_MS of
+real time, like the BUSY pin, and the next one isn't allowed until
+seconds_per_frame has passed
+"""
+
+import supervisor
+
+REFRESH_MS = 1000
+
+refreshes = []  # (ticks_ms, update mode byte) of every refresh, newest last
+
+
+def _ticks_diff(a: int, b: int) -> int:
+    return ((a - b + (1 << 28)) & ((1 << 29) - 1)) - (1 << 28)
+
+
+class EPaperDisplay:
+    def __init__(self, display_bus, start_sequence, stop_sequence, **kwargs):
+        self.width = kwargs["width"]
+        self.height = kwargs["height"]
+        self.start_sequence = bytes(start_sequence)
+        self.seconds_per_frame = kwargs.get("seconds_per_frame", 180)
+        self.root_group = None
+        self._refresh_ms = None
+
+    def update_refresh_mode(self, start_sequence, seconds_per_frame: float = 180):
+        self.start_sequence = bytes(start_sequence)
+        self.seconds_per_frame = seconds_per_frame
+
+    def _since_ms(self) -> int:
+        return _ticks_diff(supervisor.ticks_ms(), self._refresh_ms)
+
+    @property
+    def busy(self) -> bool:
+        return self._refresh_ms is not None and self._since_ms() < REFRESH_MS
+
+    @property
+    def time_to_refresh(self) -> float:
+        if self._refresh_ms is None:
+            return 0
+        return max(0, self.seconds_per_frame - self._since_ms() / 1000)
+
+    def refresh(self) -> None:
+        if self.time_to_refresh > 0:
+            raise RuntimeError("Refresh too soon")
+        self._refresh_ms = supervisor.ticks_ms()
+        refreshes.append((self._refresh_ms, self.start_sequence[-1]))
@@ -0,0 +1,3 @@
+class FourWire:
+    def __init__(self, spi_bus, *, command, chip_select, reset=None, baudrate=24000000):
+        pass
@@ -0,0 +1,52 @@
+"""
+Fake keypad. Like the real one, an edge only reaches the event queue
+when the background scanner next runs, which the tests do with scan()
+"""
+
+
+class Event:
+    def __init__(self, key_number: int = 0, pressed: bool = True):
+        self.key_number = key_number
+        self.pressed = pressed
+
+    @property
+    def released(self) -> bool:
+        return not self.pressed
+
+
+class EventQueue:
+    def __init__(self):
+        self._events = []
+
+    def get_into(self, event: Event) -> bool:
+        if not self._events:
+            return False
+        event.key_number, event.pressed = self._events.pop(0)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+class Keys:
+    def __init__(
+        self,
+        pins,
+        *,
+        value_when_pressed: bool,
+        pull: bool = True,
+        interval: float = 0.02,
+        max_events: int = 64
+    ):
+        self.interval = interval
+        self.events = EventQueue()
+        self._unscanned = []  # edges that happened since the last scan
+
+    def pulse(self, key_number: int = 0) -> None:
+        # the pin goes to its pressed value and back
+        self._unscanned.append((key_number, True))
+        self._unscanned.append((key_number, False))
+
+    def scan(self) -> None:
+        self.events._events.extend(self._unscanned)
+        self._unscanned.clear()
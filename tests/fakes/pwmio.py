@@ -0,0 +1,31 @@
+"""
+Fake pwmio, PWMOut keeps what was written to it
+"""
+
+
+class PWMOut:
+    def __init__(
+        self,
+        pin,
+        *,
+        duty_cycle: int = 0,
+        frequency: int = 500,
+        variable_frequency: bool = False
+    ):
+        self.pin = pin
+        self.variable_frequency = variable_frequency
+        self._frequency = frequency
+        self.duty_cycle = duty_cycle
+
+    @property
+    def frequency(self) -> int:
+        return self._frequency
+
+    @frequency.setter
+    def frequency(self, value: int) -> None:
+        if not self.variable_frequency:
+            raise ValueError("frequency is fixed, use variable_frequency=True")
+        self._frequency = value
+
+    def deinit(self) -> None:
+        pass
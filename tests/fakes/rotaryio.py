@@ -0,0 +1,6 @@
+class IncrementalEncoder:
+    def __init__(self, pin_a, pin_b, divisor: int = 4):
+        self.position = 0
+
+    def deinit(self) -> None:
+        pass
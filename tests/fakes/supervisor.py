@@ -0,0 +1,17 @@
+"""
+Fake supervisor, ticks_ms wraps at 2**29 like the real one
+"""
+
+import time
+
+
+class _Runtime:
+    autoreload = True
+    usb_connected = True
+
+
+runtime = _Runtime()
+
+
+def ticks_ms() -> int:
+    return int(time.monotonic() * 1000) & ((1 << 29) - 1)
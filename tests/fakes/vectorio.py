@@ -0,0 +1,9 @@
+class Rectangle:
+    def __init__(self, *, pixel_shader, width, height, x=0, y=0, color_index=0):
+        self.width = width
+        self.height = height
+
+
+class Polygon:
+    def __init__(self, *, pixel_shader, points, x=0, y=0, color_index=0):
+        self.points = points
@@ -0,0 +1,60 @@
+import alarms
+import epoch
+from alarms import ALARM_ON, ONE_SHOT, AlarmSchedule
+
+FRIDAY = epoch.days_from_civil(2024, 5, 3) * epoch.SECONDS_PER_DAY
+HOUR = 3600
+DAY = epoch.SECONDS_PER_DAY
+
+
+def test_every_day():
+    schedule = AlarmSchedule()
+    schedule.set(0, 7, 30)
+    assert schedule.next_fire(FRIDAY) == (FRIDAY + 7 * HOUR + 1800, 0)
+    # strictly after now, so an alarm that is firing plans the next day's
+    now = FRIDAY + 7 * HOUR + 1800
+    assert schedule.next_fire(now) == (now + DAY, 0)
+
+
+def test_weekdays_skip_the_weekend():
+    schedule = AlarmSchedule()
+    schedule.set(0, 7, 0, days=alarms.WEEKDAYS)
+    # Friday after 7:00, Monday is next
+    assert schedule.next_fire(FRIDAY + 8 * HOUR) == (FRIDAY + 3 * DAY + 7 * HOUR, 0)
+
+
+def test_week_wrap():
+    schedule = AlarmSchedule()
+    # Fridays only, from Friday after the alarm it is a full week away
+    schedule.set(0, 6, 0, days=1 << 5)
+    assert schedule.next_fire(FRIDAY + 5 * HOUR) == (FRIDAY + 6 * HOUR, 0)
+    assert schedule.next_fire(FRIDAY + 6 * HOUR) == (FRIDAY + 7 * DAY + 6 * HOUR, 0)
+    # Sunday only, from Friday it wraps past Saturday into the next week
+    schedule.set(0, 6, 0, days=1 << 0)
+    assert schedule.next_fire(FRIDAY + 7 * HOUR) == (FRIDAY + 2 * DAY + 6 * HOUR, 0)
+
+
+def test_earliest_alarm_wins():
+    schedule = AlarmSchedule()
+    schedule.set(0, 9, 0, days=alarms.WEEKENDS)
+    schedule.set(1, 6, 30, days=alarms.WEEKDAYS)
+    schedule.set(2, 5, 0, flags=0)  # off
+    assert schedule.next_fire(FRIDAY) == (FRIDAY + 6 * HOUR + 1800, 1)
+    assert schedule.next_fire(FRIDAY + 7 * HOUR) == (FRIDAY + DAY + 9 * HOUR, 0)
+
+
+def test_no_alarms():
+    schedule = AlarmSchedule()
+    assert schedule.next_fire(FRIDAY) == (-1, -1)
+    schedule.set(0, 7, 0, days=0)
+    assert schedule.next_fire(FRIDAY) == (-1, -1)
+
+
+def test_enable_bumps_the_version():
+    schedule = AlarmSchedule()
+    schedule.set(0, 7, 0, flags=ALARM_ON | ONE_SHOT)
+    version = schedule.version
+    schedule.enable(0, False)
+    assert schedule.version == version + 1
+    assert not schedule.is_on(0)
+    assert schedule.flags(0) == ONE_SHOT
@@ -0,0 +1,90 @@
+import busio
+
+from as1115 import AS1115, AS1115_DIGIT_REGISTER, AS1115_REGISTER
+
+
+def make_display(auto_write: bool = True) -> tuple:
+    i2c = busio.I2C()
+    display = AS1115(i2c, auto_write=auto_write)
+    display.display_hourmin(7, 30)
+    i2c.transactions = 0
+    return display, i2c
+
+
+def digits(i2c) -> list:
+    regs = i2c.regs[0x00]
+    return [regs[r] for r in AS1115_DIGIT_REGISTER[:4]]
+
+
+def test_unchanged_frame_costs_nothing():
+    display, i2c = make_display()
+    for _ in range(10):
+        display.display_hourmin(7, 30)
+        display.show()
+    assert i2c.transactions == 0
+    assert digits(i2c) == [0, 7, 3, 0]
+
+
+def test_one_digit_is_one_write():
+    display, i2c = make_display()
+    display.display_hourmin(7, 31)
+    assert i2c.transactions == 1
+    assert digits(i2c) == [0, 7, 3, 1]
+
+
+def test_changed_span_is_one_burst():
+    display, i2c = make_display(auto_write=False)
+    display.display_hourmin(8, 59)
+    assert i2c.transactions == 0
+    display.show()
+    assert i2c.transactions == 1
+    assert digits(i2c) == [0, 8, 5, 9]
+
+
+def test_repeated_winks_are_skipped():
+    display, i2c = make_display()
+    display.wink_left(False)
+    display.wink_right(True)
+    i2c.transactions = 0
+    skips = display.device.shadow_skips
+    for _ in range(10):
+        display.wink_left(False)
+        display.wink_right(True)
+        display.unwink()
+        display.show()
+    assert i2c.transactions == 0
+    assert display.device.shadow_skips == skips + 30
+
+
+def test_shadow_answers_reads():
+    display, i2c = make_display()
+    hits = display.device.shadow_hits
+    assert display.brightness == 2
+    assert display.device.global_intensity == 2
+    assert i2c.transactions == 0
+    assert display.device.shadow_hits == hits + 1
+
+
+def test_forget_and_resync_force_a_write():
+    display, i2c = make_display()
+    device = display.device
+    # a chip reset behind the driver's back
+    i2c.regs[0x00][AS1115_REGISTER["GLOBAL_INTENSITY"]] = 0
+    display.brightness = 2
+    assert i2c.transactions == 0
+    device.forget(AS1115_REGISTER["GLOBAL_INTENSITY"])
+    display.brightness = 2
+    # read back, then written since the chip disagrees
+    assert i2c.transactions == 2
+    assert i2c.regs[0x00][AS1115_REGISTER["GLOBAL_INTENSITY"]] == 2
+    i2c.regs[0x00][AS1115_REGISTER["GLOBAL_INTENSITY"]] = 0
+    i2c.regs[0x00][AS1115_DIGIT_REGISTER[3]] = 0
+    i2c.transactions = 0
+    display.resync()
+    assert i2c.transactions > 0
+    assert i2c.regs[0x00][AS1115_REGISTER["GLOBAL_INTENSITY"]] == 2
+    assert digits(i2c) == [0, 7, 3, 0]
+    # and the shadow is trusted again
+    i2c.transactions = 0
+    display.brightness = 2
+    assert i2c.transactions == 0
@@ -0,0 +1,94 @@
+from batt import SOC_MV, SOC_STEP, Batt, mv_to_percent
+
+
+def adc(mv: int) -> int:
+    # ADC reading that read_mv() turns back into mv
+    return -(-mv * 65536 // 3300)
+
+
+def make_batt(mv: int, **kwargs) -> Batt:
+    batt = Batt("VOLTAGE_MONITOR", "VBUS_SENSE", **kwargs)
+    batt._v_batt.value = adc(mv)
+    # start settled at mv
+    batt._ema = batt.read_mv() << batt.ema_shift
+    batt.percent = batt._quantize(mv_to_percent(mv))
+    return batt
+
+
+def test_lookup_clips_at_both_ends():
+    assert mv_to_percent(0) == 0
+    assert mv_to_percent(SOC_MV[0]) == 0
+    assert mv_to_percent(SOC_MV[-1]) == 100
+    assert mv_to_percent(4000) == 100
+
+
+def test_lookup_hits_the_table_points():
+    for i, mv in enumerate(SOC_MV):
+        assert mv_to_percent(mv) == i * SOC_STEP
+
+
+def test_lookup_interpolates():
+    # halfway between 2000 mV = 30 % and 2140 mV = 40 %
+    assert mv_to_percent(2070) == 35
+    assert mv_to_percent(1250) == 5
+    # monotonic over the whole range
+    percents = [mv_to_percent(mv) for mv in range(900, 3100)]
+    assert percents == sorted(percents)
+
+
+def test_read_mv():
+    batt = make_batt(2000)
+    assert batt.read_mv() == 2000
+
+
+def test_ema_smooths_a_step():
+    batt = make_batt(2000, ema_shift=3)
+    batt._v_batt.value = adc(2800)
+    # each sample closes 1/8 of the gap
+    batt.update()
+    assert batt._ema >> 3 == 2100
+    for _ in range(60):
+        batt.update()
+    assert abs((batt._ema >> 3) - 2800) <= 8
+    assert batt.percent == 90
+
+
+def test_single_outlier_is_filtered():
+    batt = make_batt(2140, ema_shift=3)  # 40 %
+    # a 200 mV spike only moves the average 25 mV
+    batt._v_batt.value = adc(2340)
+    assert batt.update() == 40
+    batt._v_batt.value = adc(2140)
+    for _ in range(20):
+        assert batt.update() == 40
+
+
+def test_hysteresis_around_a_step():
+    # no smoothing, so the raw percentage is what the table says
+    batt = make_batt(2140, ema_shift=0, step=5, hysteresis=1)  # 40 %
+    # 42 % and 43 % are past halfway to 45 % but inside the hysteresis
+    for mv in (2168, 2182, 2168):
+        batt._v_batt.value = adc(mv)
+        assert batt.update() == 40
+    batt._v_batt.value = adc(2196)  # 44 %
+    assert batt.update() == 45
+    # and on the way back 43 % and 42 % keep 45 %
+    for mv in (2182, 2168):
+        batt._v_batt.value = adc(mv)
+        assert batt.update() == 45
+    batt._v_batt.value = adc(2154)  # 41 %
+    assert batt.update() == 40
+
+
+def test_get_batt_frac_is_quantized():
+    batt = make_batt(2260)  # 50 %
+    assert batt.get_batt_frac() == 0.5
+
+
+def test_history_keeps_every_nth_filtered_sample():
+    batt = make_batt(2140, ema_shift=0, history_every=6)  # 40 %
+    for i in range(12):
+        # 41 % is filtered but not reported
+        batt._v_batt.value = adc(2154 if i >= 6 else 2140)
+        assert batt.sample() == 40
+    assert [batt.history.get(k) for k in range(len(batt.history))] == [40, 41]
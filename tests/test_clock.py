@@ -0,0 +1,198 @@
+import time
+
+import adafruit_ds3231
+import busio
+
+import alarms
+import epoch
+from clock import Clock
+
+
+def make_clock(t: time.struct_time) -> tuple:
+    i2c = busio.I2C()
+    adafruit_ds3231.DS3231(i2c).datetime = t
+    clock = Clock(i2c)
+    i2c.transactions = 0
+    return clock, i2c
+
+
+def rtc_time(i2c) -> time.struct_time:
+    return adafruit_ds3231.DS3231(i2c).datetime
+
+
+def test_update_reads_rtc_once():
+    clock, i2c = make_clock(
+        epoch.to_struct_time(epoch.days_from_civil(2024, 5, 3) * 86400)
+    )
+    clock.update()
+    assert i2c.transactions == 1
+    assert clock.i2c_count == 1
+    assert clock.get_date_str() == "Fri, May 3rd, 2024"
+
+
+def test_set_time_one_read_one_write():
+    start = epoch.to_struct_time(946684800 + 12345678)
+    clock, i2c = make_clock(start)
+    before = clock.i2c_count  # counts since the last update()
+    clock.set_time(7, 45)
+    assert i2c.transactions == 2
+    assert clock.i2c_count - before == 2
+    t = rtc_time(i2c)
+    assert t[:3] == start[:3]
+    assert (t.tm_hour, t.tm_min, t.tm_sec) == (7, 45, 0)
+    assert t.tm_wday == start.tm_wday
+
+
+def test_set_date_writes_integer_weekday():
+    start = epoch.to_struct_time(epoch.days_from_civil(2023, 11, 7) * 86400 + 3723)
+    clock, i2c = make_clock(start)
+    clock.set_date(2024, 2, 29)
+    assert i2c.transactions == 2
+    t = rtc_time(i2c)
+    assert t[:6] == (2024, 2, 29, 1, 2, 3)
+    assert t.tm_wday == 4  # Thursday
+    assert clock.get_date_str() == "Thu, Feb 29th, 2024"
+
+
+def test_set_date_weekday_matches_to_struct_time():
+    start = epoch.to_struct_time(946684800)  # 2000-01-01
+    clock, i2c = make_clock(start)
+    for days in range(
+        epoch.days_from_civil(2024, 1, 1), epoch.days_from_civil(2025, 1, 1), 5
+    ):
+        year, month, day = epoch.civil_from_days(days)
+        clock.set_date(year, month, day)
+        assert clock.now.tm_wday == epoch.to_struct_time(days * 86400).tm_wday
+
+
+class SquareWave:
+    """
+    The DS3231 and its 1 Hz output, each tick() advances the RTC a second
+    and pulses the pin, the scanner only sees it on its next scan
+    """
+
+    def __init__(self, i2c, clock: Clock):
+        self.i2c = i2c
+        self.rtc = adafruit_ds3231.DS3231(i2c)
+        self.keys = clock.sqw
+
+    def tick(self, scan: bool = True) -> None:
+        # the chip counting on its own isn't bus traffic
+        transactions = self.i2c.transactions
+        self.rtc.datetime = epoch.to_struct_time(epoch.to_epoch(self.rtc.datetime) + 1)
+        self.i2c.transactions = transactions
+        self.keys.pulse()
+        if scan:
+            self.keys.scan()
+
+
+def make_sqw_clock(t: time.struct_time) -> tuple:
+    clock, i2c = make_clock(t)
+    clock = Clock(i2c, sqw_pin="GP3")
+    i2c.transactions = 0
+    return clock, SquareWave(i2c, clock), i2c
+
+
+def test_update_counts_edges_without_i2c():
+    start = epoch.days_from_civil(2024, 5, 3) * 86400 + 9 * 3600
+    clock, sqw, i2c = make_sqw_clock(epoch.to_struct_time(start))
+    for i in range(1, 60):
+        sqw.tick()
+        clock.update()
+        assert clock.epoch_now == start + i
+    assert i2c.transactions == 0
+
+
+def test_resync_on_the_hour():
+    start = epoch.days_from_civil(2024, 5, 3) * 86400 + 10 * 3600 - 3
+    clock, sqw, i2c = make_sqw_clock(epoch.to_struct_time(start))
+    resyncs = clock.resyncs
+    for _ in range(2):
+        sqw.tick()
+        clock.update()
+    assert clock.resyncs == resyncs
+    assert i2c.transactions == 0
+    sqw.tick()
+    clock.update()
+    assert clock.resyncs == resyncs + 1
+    assert clock.epoch_now == start + 3
+    # the next one is an hour later
+    for _ in range(100):
+        sqw.tick()
+        clock.update()
+    assert clock.resyncs == resyncs + 1
+
+
+def test_resync_sees_an_edge_still_in_the_scanner(monkeypatch):
+    start = epoch.days_from_civil(2024, 5, 3) * 86400 + 9 * 3600
+    clock, sqw, i2c = make_sqw_clock(epoch.to_struct_time(start))
+    # keypad scans in the background while Clock waits
+    monkeypatch.setattr(time, "sleep", lambda s: sqw.keys.scan())
+    # the RTC has moved on, but keypad hasn't reported the edge yet
+    sqw.tick(scan=False)
+    clock.resync()
+    sqw.keys.scan()
+    clock.update()
+    assert clock.epoch_now == start + 1
+
+
+def test_write_sees_an_edge_still_in_the_scanner(monkeypatch):
+    start = epoch.days_from_civil(2024, 5, 3) * 86400 + 9 * 3600
+    clock, sqw, i2c = make_sqw_clock(epoch.to_struct_time(start))
+    sleeps = []
+
+    def sleep(seconds):
+        sqw.keys.scan()
+        if not sleeps:
+            # the read is done, the RTC ticks before the write and keypad
+            # only reports the edge after it
+            sqw.tick(scan=False)
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(time, "sleep", sleep)
+    clock.patch_datetime(min=15, sec=0)
+    clock.update()
+    assert clock.epoch_now == start + 15 * 60
+    sqw.tick()
+    clock.update()
+    assert clock.epoch_now == start + 15 * 60 + 1
+
+
+def test_alarm_rings_and_times_out():
+    start = epoch.days_from_civil(2024, 5, 3) * 86400 + 7 * 3600 + 29 * 60 + 58
+    clock, sqw, i2c = make_sqw_clock(epoch.to_struct_time(start))
+    clock.set_alarm(7, 30)
+    assert clock.get_epoch_alarm() == start + 2
+    assert clock.get_alarm_str() == "7:30 Fri"
+    sqw.tick()
+    clock.update()
+    assert not clock.get_alarm_status()
+    sqw.tick()
+    clock.update()
+    assert clock.get_alarm_status()
+    assert clock.ringing_idx == 0
+    # the next one is planned as soon as this one fires
+    assert clock.get_epoch_alarm() == start + 2 + 86400
+    for _ in range(clock.alarm_delta_max + 1):
+        sqw.tick()
+        clock.update()
+    assert not clock.get_alarm_status()
+    assert clock.ringing_idx == -1
+
+
+def test_one_shot_alarm_turns_itself_off():
+    start = epoch.days_from_civil(2024, 5, 3) * 86400 + 7 * 3600 + 29 * 60 + 59
+    clock, sqw, i2c = make_sqw_clock(epoch.to_struct_time(start))
+    clock.schedule.set(1, 7, 30, flags=alarms.ALARM_ON | alarms.ONE_SHOT)
+    clock.set_alarm(8, 0)
+    clock.update()
+    assert (clock.get_epoch_alarm(), clock.next_alarm_idx) == (start + 1, 1)
+    sqw.tick()
+    clock.update()
+    assert clock.ringing_idx == 1
+    assert not clock.schedule.is_on(1)
+    # the daily one is next, the one-shot isn't planned again
+    assert clock.next_alarm_idx == 0
+    assert clock.get_epoch_alarm() == start + 1 + 1800
+    # no alarm writes while the square wave has INT
+    assert i2c.transactions == 0
@@ -0,0 +1,28 @@
+import calendar
+import time
+
+import epoch
+
+
+def test_to_epoch_matches_timegm():
+    for seconds in range(0, 2**31, 86400 * 37 + 3671):
+        t = time.gmtime(seconds)
+        assert epoch.to_epoch(t) == calendar.timegm(t)
+
+
+def test_to_struct_time_round_trip():
+    for seconds in range(0, 2**31, 86400 * 37 + 3671):
+        t = epoch.to_struct_time(seconds)
+        g = time.gmtime(seconds)
+        assert t[:6] == g[:6]
+        assert t.tm_yday == g.tm_yday
+        # gmtime counts from Monday = 0, epoch from Sunday = 0
+        assert t.tm_wday == (g.tm_wday + 1) % 7
+        assert epoch.to_epoch(t) == seconds
+
+
+def test_days_from_civil_leap_years():
+    assert epoch.days_from_civil(1970, 1, 1) == 0
+    assert epoch.days_from_civil(2000, 3, 1) - epoch.days_from_civil(2000, 2, 28) == 2
+    assert epoch.days_from_civil(2100, 3, 1) - epoch.days_from_civil(2100, 2, 28) == 1
+    assert epoch.civil_from_days(epoch.days_from_civil(2024, 2, 29)) == (2024, 2, 29)
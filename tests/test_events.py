@@ -0,0 +1,81 @@
+from events import EVENT_NONE, ON_RELEASE, REPEAT, EventQueue, KeyEvents
+
+KEY_TAP = 1 << 0
+KEY_HOLD = 1 << 1
+KEY_REPEAT = 1 << 2
+KEY_ENTER = 1 << 3
+
+KEYMAP = (
+    (KEY_TAP, 1, EVENT_NONE, 0),
+    (KEY_HOLD, 2, 3, ON_RELEASE),
+    (KEY_REPEAT, 4, EVENT_NONE, REPEAT),
+    (KEY_ENTER, 5, EVENT_NONE, ON_RELEASE),
+)
+
+
+def drain(queue: EventQueue) -> list:
+    events = []
+    event = queue.get()
+    while event != EVENT_NONE:
+        events.append((event, queue.t_ms))
+        event = queue.get()
+    return events
+
+
+def hold(key: int, down_ms: int, up_ms: int, tick_ms: int = 10) -> list:
+    queue = EventQueue()
+    keys = KeyEvents(queue, KEYMAP, long_ms=1000, repeat_ms=250)
+    keys.update(key, 0, down_ms)
+    for t in range(down_ms, up_ms, tick_ms):
+        keys.tick(t)
+    keys.update(0, key, up_ms)
+    return drain(queue)
+
+
+def test_queue_is_read_oldest_first():
+    queue = EventQueue(4)
+    for i in range(1, 4):
+        queue.put(i, i * 100)
+    assert len(queue) == 3
+    assert drain(queue) == [(1, 100), (2, 200), (3, 300)]
+    assert queue.get() == EVENT_NONE
+
+
+def test_full_queue_drops_the_oldest():
+    queue = EventQueue(4)
+    # wraps the ring twice
+    for i in range(1, 11):
+        queue.put(i, i)
+    assert len(queue) == 4
+    assert queue.dropped == 6
+    assert drain(queue) == [(7, 7), (8, 8), (9, 9), (10, 10)]
+
+
+def test_tap_fires_on_press():
+    assert hold(KEY_TAP, 0, 1500) == [(1, 0)]
+
+
+def test_long_press_replaces_the_release_event():
+    assert hold(KEY_HOLD, 0, 300) == [(2, 300)]
+    assert hold(KEY_HOLD, 0, 1500) == [(3, 1000)]
+
+
+def test_auto_repeat():
+    events = hold(KEY_REPEAT, 0, 1600)
+    assert events == [(4, 0), (4, 1000), (4, 1250), (4, 1500)]
+
+
+def test_slow_enter_still_fires_on_release():
+    assert hold(KEY_ENTER, 0, 300) == [(5, 300)]
+    assert hold(KEY_ENTER, 0, 1500) == [(5, 1500)]
+
+
+def test_long_press_across_ticks_wraparound():
+    start = (1 << 29) - 500
+    queue = EventQueue()
+    keys = KeyEvents(queue, KEYMAP, long_ms=1000)
+    keys.update(KEY_HOLD, 0, start)
+    keys.tick(400)
+    assert len(queue) == 0
+    keys.tick(500)
+    assert drain(queue) == [(3, 500)]
@@ -0,0 +1,50 @@
+import fsm as fsm_ids
+from fsm import FSM
+
+
+def run(fsm: FSM, events: tuple) -> list:
+    return [fsm.execute(event) for event in events]
+
+
+def test_set_alarm_flow():
+    fsm = FSM()
+    actions = run(
+        fsm,
+        (
+            fsm_ids.EV_SET_ALARM,
+            fsm_ids.EV_NONE,
+            fsm_ids.EV_ENTER,
+            fsm_ids.EV_NONE,
+            fsm_ids.EV_ENTER,
+        ),
+    )
+    assert actions == [
+        fsm_ids.A_START_SET_ALARM,
+        fsm_ids.A_SET_ALARM_HOUR,
+        fsm_ids.A_START_SET_ALARM_MIN,
+        fsm_ids.A_SET_ALARM_MIN,
+        fsm_ids.A_END_SET_ALARM_MIN,
+    ]
+    assert fsm.state == fsm_ids.DEFAULT
+
+
+def test_alarm_preempts_every_state():
+    for state in range(fsm_ids.N_STATES):
+        fsm = FSM()
+        fsm.state = state
+        fsm.execute(fsm_ids.EV_ALARM)
+        assert fsm.state == fsm_ids.ALARMING
+
+
+def test_alarming_exits():
+    for event, action in (
+        (fsm_ids.EV_RF, fsm_ids.A_SNOOZE),
+        (fsm_ids.EV_ALARM_OFF, fsm_ids.A_END_ALARMING),
+        (fsm_ids.EV_ENTER, fsm_ids.A_END_ALARMING),
+        (fsm_ids.EV_BACK, fsm_ids.A_END_ALARMING),
+    ):
+        fsm = FSM()
+        run(fsm, (fsm_ids.EV_ALARM, fsm_ids.EV_NONE, fsm_ids.EV_ENCODER))
+        assert fsm.state == fsm_ids.ALARMING
+        assert fsm.execute(event) == action
+        assert fsm.state == fsm_ids.DEFAULT
@@ -0,0 +1,108 @@
+import alarm
+
+import fsm as fsm_ids
+from idle import ALARM_GUARD_S, IDLE_AFTER_MS, SLEEP_MIN_S, IdleSleep, idle_sleep_s
+
+
+def sleep_s(**kwargs) -> int:
+    # idle on battery at hh:mm:00 unless overridden
+    args = dict(
+        state=fsm_ids.DEFAULT,
+        usb=False,
+        busy=False,
+        sec=0,
+        quiet_ms=IDLE_AFTER_MS,
+        alarm_in_s=None,
+    )
+    args.update(kwargs)
+    return idle_sleep_s(**args)
+
+
+def test_sleeps_until_the_next_minute():
+    assert sleep_s() == 60
+    assert sleep_s(sec=45) == 15
+
+
+def test_stays_awake_on_usb():
+    assert sleep_s(usb=True) == 0
+
+
+def test_stays_awake_while_editing():
+    for state in range(fsm_ids.N_STATES):
+        if state != fsm_ids.DEFAULT:
+            assert sleep_s(state=state) == 0
+
+
+def test_stays_awake_while_busy():
+    assert sleep_s(busy=True) == 0
+
+
+def test_stays_awake_after_input():
+    assert sleep_s(quiet_ms=IDLE_AFTER_MS - 1) == 0
+
+
+def test_alarm_guard():
+    assert sleep_s(alarm_in_s=ALARM_GUARD_S) == 0
+    assert sleep_s(alarm_in_s=0) == 0
+    assert sleep_s(alarm_in_s=ALARM_GUARD_S + 1) == 60
+
+
+def test_short_sleeps_are_skipped():
+    assert sleep_s(sec=60 - SLEEP_MIN_S) == SLEEP_MIN_S
+    assert sleep_s(sec=60 - SLEEP_MIN_S + 1) == 0
+
+
+class Input:
+    def __init__(self, name: str):
+        self.pin = name
+        self.claimed = True
+        self.log = []
+
+    def release(self):
+        assert self.claimed
+        self.claimed = False
+        self.log.append("release")
+
+    def claim(self):
+        assert not self.claimed
+        self.claimed = True
+        self.log.append("claim")
+
+
+def make_sleeper() -> tuple:
+    inputs = (Input("GP11"), Input("GP12"))
+    alarm.WAKE_PIN = None
+    alarm.sleeps.clear()
+    return IdleSleep(alarm, inputs), inputs
+
+
+def test_pins_are_released_while_asleep():
+    sleeper, inputs = make_sleeper()
+    assert not sleeper.sleep(30)
+    for inp in inputs:
+        assert inp.log == ["release", "claim"]
+    timeout, *wakes = alarm.sleeps[0]
+    assert isinstance(timeout, alarm.TimeAlarm)
+    assert [wake.pin for wake in wakes] == ["GP11", "GP12"]
+
+
+def test_pins_are_reclaimed_if_sleep_fails():
+    sleeper, inputs = make_sleeper()
+    sleep = alarm.light_sleep_until_alarms
+    alarm.light_sleep_until_alarms = lambda *alarms: 1 / 0
+    try:
+        sleeper.sleep(30)
+    except ZeroDivisionError:
+        pass
+    finally:
+        alarm.light_sleep_until_alarms = sleep
+    assert all(inp.claimed for inp in inputs)
+
+
+def test_input_wakes_are_counted():
+    sleeper, inputs = make_sleeper()
+    assert not sleeper.sleep(30)
+    alarm.WAKE_PIN = inputs[1].pin
+    assert sleeper.sleep(30)
+    assert sleeper.sleeps == 2
+    assert sleeper.input_wakes == 1
@@ -0,0 +1,111 @@
+"""
+Renders the e-ink layout with inkhost and diffs it against the golden
+frames in tests/golden. Terminus isn't in this repo, so the frames use a
+made up 6x12 font where every glyph is a box with its codepoint's bits
+inside, which still shows every label's position, anchor and width
+
+python tests/test_inkhost.py updates the golden frames
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+
+import inklayout
+from inkhost import BDFFont, HostDisp, count_diff, read_pbm
+
+GOLDEN = os.path.join(HERE, "golden")
+
+
+def write_font(path: str):
+    chars = list(range(32, 127)) + [ord("°")]
+    lines = [
+        "STARTFONT 2.1",
+        "FONT boxes-6x12",
+        "SIZE 12 75 75",
+        "FONTBOUNDINGBOX 6 12 0 -2",
+        "STARTPROPERTIES 2",
+        "FONT_ASCENT 10",
+        "FONT_DESCENT 2",
+        "ENDPROPERTIES",
+        "CHARS {}".format(len(chars)),
+    ]
+    for code in chars:
+        if code == 32:
+            rows = []
+        else:
+            # 5 wide, 8 high box, the middle rows hold bits of the codepoint
+            rows = [0xF8] + [0x88 | ((code >> i) & 1) << 5 for i in range(6)]
+            rows.append(0xF8)
+        lines += [
+            "STARTCHAR U+{:04X}".format(code),
+            "ENCODING {}".format(code),
+            "SWIDTH 500 0",
+            "DWIDTH 6 0",
+            "BBX 5 {} 0 0".format(len(rows)),
+            "BITMAP",
+        ]
+        lines += ["{:02X}".format(row) for row in rows]
+        lines.append("ENDCHAR")
+    lines.append("ENDFONT")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def render_info(font_path: str) -> HostDisp:
+    disp = HostDisp(BDFFont(font_path))
+    disp.apply_info(
+        date="Sat, Jan 1st, 2000",
+        alarm="7:30 Mon",
+        temp=21.5,
+        humidity=40,
+        batt=0.8,
+        usb=False,
+    )
+    disp.set_env_range((18.2, 23.1, 20.5), (35, 60, 47.5))
+    for i in range(inklayout.SPARK_COLUMNS):
+        disp.push_samples(temp=20 + i % 24 / 4, humidity=40 + i % 7, batt=1 - i / 200)
+    disp.render()
+    return disp
+
+
+def check_golden(disp: HostDisp, name: str, out_dir: str):
+    width, height, frame = read_pbm(os.path.join(GOLDEN, name))
+    assert (width, height) == (disp.width, disp.height)
+    diff = count_diff(disp.frame, frame)
+    if diff:
+        # keep the frame that didn't match next to the test's temp files
+        disp.write_png(os.path.join(out_dir, name.replace(".pbm", ".png")))
+    assert diff == 0
+
+
+def test_info_frame(tmp_path):
+    font = str(tmp_path / "boxes.bdf")
+    write_font(font)
+    disp = render_info(font)
+    check_golden(disp, "info.pbm", str(tmp_path))
+
+
+def test_battery_tick_only_changes_its_label(tmp_path):
+    font = str(tmp_path / "boxes.bdf")
+    write_font(font)
+    disp = render_info(font)
+    assert disp.set_power(0.79, False)
+    changed = disp.render()
+    assert changed > 0
+    check_golden(disp, "battery_tick.pbm", str(tmp_path))
+    # nothing changed, nothing to redraw
+    assert disp.render() == 0
+
+
+if __name__ == "__main__":
+    font = os.path.join(GOLDEN, "boxes.bdf")
+    write_font(font)
+    disp = render_info(font)
+    disp.write_pbm(os.path.join(GOLDEN, "info.pbm"))
+    disp.set_power(0.79, False)
+    disp.render()
+    disp.write_pbm(os.path.join(GOLDEN, "battery_tick.pbm"))
+    os.remove(font)
@@ -0,0 +1,92 @@
+import inkschedule
+from inkschedule import RefreshScheduler
+
+DAY = 19000 * 86400  # some epoch time at midnight
+
+
+def test_window_coalesces_lower_priority_fields():
+    scheduler = RefreshScheduler()
+    scheduler.mark(inkschedule.FIELD_ENV, 0)
+    scheduler.mark(inkschedule.FIELD_ALARM, 500)
+    assert scheduler.due(2000, DAY) == inkschedule.REFRESH_NONE
+    assert scheduler.due(2500, DAY) == inkschedule.REFRESH_PARTIAL
+    assert scheduler.coalesced == 1
+    assert scheduler.due(400000, DAY) == inkschedule.REFRESH_NONE
+
+
+def test_setting_the_clock_back_does_not_stall():
+    scheduler = RefreshScheduler()
+    scheduler.mark(inkschedule.FIELD_ALARM, 1000)
+    assert scheduler.due(3000, DAY + 3600) == inkschedule.REFRESH_PARTIAL
+    # the clock goes back an hour, the windows only see ticks_ms
+    scheduler.mark(inkschedule.FIELD_ALARM, 9000)
+    assert scheduler.due(11000, DAY) == inkschedule.REFRESH_PARTIAL
+
+
+def test_windows_across_ticks_wraparound():
+    scheduler = RefreshScheduler()
+    start = (1 << 29) - 1000
+    scheduler.mark(inkschedule.FIELD_ALARM, start)
+    assert scheduler.due(500, DAY) == inkschedule.REFRESH_NONE
+    assert scheduler.due(1000, DAY) == inkschedule.REFRESH_PARTIAL
+
+
+def test_min_interval_and_full_every():
+    scheduler = RefreshScheduler(full_every=2)
+    results = []
+    now = 0
+    for _ in range(6):
+        scheduler.mark(inkschedule.FIELD_ALARM, now)
+        now += 2000
+        results.append(scheduler.due(now, DAY))
+        now += 5000
+    assert results == [
+        inkschedule.REFRESH_PARTIAL,
+        inkschedule.REFRESH_PARTIAL,
+        inkschedule.REFRESH_FULL,
+        inkschedule.REFRESH_PARTIAL,
+        inkschedule.REFRESH_PARTIAL,
+        inkschedule.REFRESH_FULL,
+    ]
+    # 3 s after the last refresh
+    scheduler.mark(inkschedule.FIELD_ALARM, now - 4000)
+    assert scheduler.due(now - 2000, DAY) == inkschedule.REFRESH_NONE
+    assert scheduler.deferred_interval == 1
+
+
+def test_daily_budget_spares_the_alarm():
+    scheduler = RefreshScheduler(daily_budget=1)
+    scheduler.mark(inkschedule.FIELD_POWER, 0)
+    assert scheduler.due(300000, DAY) == inkschedule.REFRESH_PARTIAL
+    scheduler.mark(inkschedule.FIELD_POWER, 300000)
+    assert scheduler.due(600000, DAY) == inkschedule.REFRESH_NONE
+    assert scheduler.deferred_budget == 1
+    scheduler.mark(inkschedule.FIELD_ALARM, 600000)
+    assert scheduler.due(602000, DAY) == inkschedule.REFRESH_PARTIAL
+    scheduler.mark(inkschedule.FIELD_POWER, 610000)
+    assert scheduler.due(910000, DAY) == inkschedule.REFRESH_NONE
+    # the next day's budget lets the power field through
+    assert scheduler.due(920000, DAY + 86400) == inkschedule.REFRESH_PARTIAL
+
+
+def test_a_deferred_refresh_is_counted_once():
+    scheduler = RefreshScheduler(daily_budget=1)
+    scheduler.mark(inkschedule.FIELD_ALARM, 0)
+    assert scheduler.due(2000, DAY) == inkschedule.REFRESH_PARTIAL
+    scheduler.mark(inkschedule.FIELD_ALARM, 0)
+    # polled every second until the min interval is over
+    for now in range(2100, 7000, 1000):
+        assert scheduler.due(now, DAY) == inkschedule.REFRESH_NONE
+    assert scheduler.deferred_interval == 1
+    assert scheduler.due(7000, DAY) == inkschedule.REFRESH_PARTIAL
+    # over budget, the power field waits for the next day
+    scheduler.mark(inkschedule.FIELD_POWER, 7000)
+    for now in range(307000, 400000, 1000):
+        assert scheduler.due(now, DAY) == inkschedule.REFRESH_NONE
+    assert scheduler.deferred_budget == 1
+    assert scheduler.due(400000, DAY + 86400) == inkschedule.REFRESH_PARTIAL
+    # a new deferral counts again
+    scheduler.mark(inkschedule.FIELD_ALARM, 400000)
+    assert scheduler.due(402000, DAY + 86400) == inkschedule.REFRESH_NONE
+    assert scheduler.due(403000, DAY + 86400) == inkschedule.REFRESH_NONE
+    assert scheduler.deferred_interval == 2
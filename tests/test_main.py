@@ -0,0 +1,189 @@
+"""
+Runs main's tasks on the fake hardware in tests/fakes, in real time, and
+measures input latency while the e-ink panel is refreshing: from the
+AS1115 IRQ edge of a key press to the FSM running the key's action.
+A refresh takes REFRESH_MS on the fake panel and the first one starts at
+boot, so the presses land during it
+
+python tests/test_main.py prints the latencies
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+sys.path.insert(0, os.path.join(HERE, "fakes"))
+
+import busio
+import countio
+import epaperdisplay
+import supervisor
+
+AS1115 = 0x00
+KEY_A = 0x1C
+DS3231 = 0x68
+PRESSES = 5
+PRESS_EVERY_MS = 150
+
+
+def load_main():
+    # keys released, active low, and the RTC at Fri 2024-05-03 07:30:00
+    busio.RESET_VALUES[AS1115] = {KEY_A: 0xFF, KEY_A + 1: 0xFF}
+    busio.RESET_VALUES[DS3231] = {1: 0x30, 2: 0x07, 3: 6, 4: 0x03, 5: 0x05, 6: 0x24}
+    epaperdisplay.REFRESH_MS = 3000
+    epaperdisplay.refreshes.clear()
+    run = asyncio.run
+    asyncio.run = lambda coro: coro.close()  # importing main starts nothing
+    try:
+        sys.modules.pop("main", None)
+        import main
+    finally:
+        asyncio.run = run
+    return main
+
+
+class Recorder:
+    """
+    Wraps main's action handlers and logs (ticks_ms, state after) per action
+    """
+
+    def __init__(self, main):
+        self.main = main
+        self.log = []
+        main.ACTIONS = tuple(self.wrap(handler) for handler in main.ACTIONS)
+
+    def wrap(self, handler):
+        def recorded():
+            handler()
+            self.log.append((supervisor.ticks_ms(), self.main.fsm.state))
+
+        return recorded
+
+    def first_state_at(self, state: int, since_ms: int) -> int:
+        for ms, s in self.log:
+            if s == state and ms >= since_ms:
+                return ms
+        return -1
+
+
+async def press(main, key: int, down: bool) -> int:
+    # the chip debounces, latches the keyscan and pulls IRQ low
+    regs = main.i2c.regs[AS1115]
+    if down:
+        regs[KEY_A] &= ~key
+    else:
+        regs[KEY_A] |= key
+    countio.COUNTERS["GP11"].count += 1
+    return supervisor.ticks_ms()
+
+
+async def scenario(main) -> tuple:
+    import fsm as fsm_ids
+
+    recorder = Recorder(main)
+    app = asyncio.create_task(main.main())
+    latencies = []
+    busy = []
+    await asyncio.sleep(0.1)
+    for _ in range(PRESSES):
+        # set time opens the hour editor, back closes it
+        for key, state in (
+            (main.KEY_SET_TIME, fsm_ids.SET_HOUR),
+            (main.KEY_BACK, fsm_ids.DEFAULT),
+        ):
+            busy.append(main.inkdisp.display.busy)
+            t0 = await press(main, key, True)
+            await asyncio.sleep(PRESS_EVERY_MS / 2000)
+            await press(main, key, False)
+            await asyncio.sleep(PRESS_EVERY_MS / 2000)
+            latencies.append(recorder.first_state_at(state, t0) - t0)
+    app.cancel()
+    try:
+        await app
+    except asyncio.CancelledError:
+        pass
+    return latencies, busy
+
+
+def test_input_latency_during_eink_refresh():
+    main = load_main()
+    latencies, busy = asyncio.run(scenario(main))
+    # every press landed while the panel was refreshing
+    assert all(busy)
+    assert len(epaperdisplay.refreshes) == 1
+    # and was handled within a couple of input polls, not after the refresh
+    assert min(latencies) >= 0
+    assert max(latencies) < 100
+
+
+async def run_tasks(main, seconds: float, *tasks):
+    running = [asyncio.create_task(task()) for task in tasks]
+    await asyncio.sleep(seconds)
+    for task in running:
+        task.cancel()
+    await asyncio.gather(*running, return_exceptions=True)
+
+
+def test_light_sleep_shows_the_digits_and_yields():
+    main = load_main()
+    order = []
+    show = main.as1115.show
+    poll = main.keys.poll
+
+    def logged(name, func):
+        def call(*args):
+            order.append(name)
+            return func(*args)
+
+        return call
+
+    main.as1115.show = logged("show", show)
+    main.keys.poll = logged("poll", poll)
+
+    def light_sleep(seconds):
+        # time passes while asleep, so input_task's next poll is due on waking
+        time.sleep(2 * main.period_input / 1000)
+        return False
+
+    main.sleeper.sleep = logged("sleep", light_sleep)
+    main.idle_seconds = lambda: 30 if order.count("sleep") < 3 else 0
+    asyncio.run(run_tasks(main, 0.2, main.input_task, main.fsm_task))
+    sleeps = [i for i, name in enumerate(order) if name == "sleep"]
+    assert len(sleeps) == 3
+    for i in sleeps:
+        # the digits go out right before each sleep
+        assert order[i - 1] == "show"
+    for a, b in zip(sleeps, sleeps[1:]):
+        # and input_task runs between two sleeps
+        assert "poll" in order[a:b]
+
+
+def test_snooze_needs_a_ringing_alarm():
+    main = load_main()
+    main.clock.reset_alarm()
+    main.do_snooze()
+    assert not main.timers.active(main.T_SNOOZE)
+    main.clock.ring(0)
+    main.do_snooze()
+    assert main.timers.active(main.T_SNOOZE)
+    assert main.shared.snoozed == 0
+    assert main.clock.ringing_idx == -1
+
+
+if __name__ == "__main__":
+    main = load_main()
+    latencies, busy = asyncio.run(scenario(main))
+    print(
+        "refresh: {} ms, presses during it: {}".format(
+            epaperdisplay.REFRESH_MS, sum(busy)
+        )
+    )
+    print("latency ms: {}".format(latencies))
+    print(
+        "max {} ms, mean {:.1f} ms".format(
+            max(latencies), sum(latencies) / len(latencies)
+        )
+    )
@@ -0,0 +1,67 @@
+import utils
+from piezo import ALARM_MELODY, Piezo, melody
+
+
+def note_starts(buzzer: Piezo, start_ms: int, end_ms: int, step_ms: int) -> list:
+    # (ms since start, frequency) whenever the sound changes
+    starts = []
+    sound = None
+    for t in range(start_ms, end_ms, step_ms):
+        now = t & utils.TICKS_MAX
+        buzzer.update(now)
+        freq = buzzer.buzzer.frequency if buzzer.buzzer.duty_cycle else 0
+        if freq != sound:
+            sound = freq
+            starts.append((t - start_ms, freq))
+    return starts
+
+
+def test_melody_table():
+    table = melody(("c4", 100), (None, 50), (880, 25))
+    assert list(table) == [262, 100, 0, 50, 880, 25]
+
+
+def test_loop_stays_on_the_grid():
+    buzzer = Piezo("GP2")
+    buzzer.start(ALARM_MELODY, 0, loop=True)
+    starts = note_starts(buzzer, 0, 3300, 1)
+    assert starts == [
+        (0, 262),
+        (150, 330),
+        (300, 392),
+        (450, 262),
+        (600, 330),
+        (750, 392),
+        (1050, 0),
+        (1650, 262),
+        (1800, 330),
+        (1950, 392),
+        (2100, 262),
+        (2250, 330),
+        (2400, 392),
+        (2700, 0),
+    ]
+    assert buzzer.late_notes == 0
+
+
+def test_late_updates_keep_the_tempo():
+    buzzer = Piezo("GP2")
+    start = utils.TICKS_MAX - 1000  # across the ticks wraparound
+    buzzer.start(ALARM_MELODY, start, loop=True)
+    # called every 70 ms, each change lands at most 70 ms after its note
+    for ms, freq in note_starts(buzzer, start, start + 3300, 70):
+        grid = (0, 150, 300, 450, 600, 750, 1050, 1650)
+        assert any(0 <= (ms - g) % 1650 < 70 for g in grid)
+    # a call 400 ms late skips notes and counts them
+    buzzer.start(ALARM_MELODY, 0, loop=True)
+    buzzer.update(400)
+    assert buzzer.late_notes == 1
+    assert buzzer.buzzer.frequency == 392  # third note, 300 - 450 ms
+
+
+def test_one_shot_stops():
+    buzzer = Piezo("GP2")
+    buzzer.start(melody(("a4", 100)), 0)
+    assert buzzer.update(99)
+    assert not buzzer.update(100)
+    assert buzzer.buzzer.duty_cycle == 0
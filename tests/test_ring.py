@@ -0,0 +1,60 @@
+import random
+
+from ring import RingStats
+
+
+def test_empty():
+    ring = RingStats(4)
+    assert len(ring) == 0
+    assert ring.min() is None
+    assert ring.max() is None
+    assert ring.mean() is None
+
+
+def test_wraparound_evicts_the_oldest():
+    ring = RingStats(3)
+    for value in (5, -2, 7):
+        ring.push(value)
+    assert (ring.min(), ring.max(), ring.mean()) == (-2, 7, 10 / 3)
+    # -2 is the min until it is overwritten
+    ring.push(1)
+    assert [ring.get(k) for k in range(3)] == [-2, 7, 1]
+    assert ring.min() == -2
+    ring.push(3)
+    assert [ring.get(k) for k in range(3)] == [7, 1, 3]
+    assert (ring.min(), ring.max(), ring.mean()) == (1, 7, 11 / 3)
+    ring.push(2)
+    assert (ring.min(), ring.max(), ring.mean()) == (1, 3, 2)
+    assert ring.latest() == 2
+    assert len(ring) == 3
+
+
+def test_matches_brute_force():
+    rng = random.Random(1)
+    for size in (1, 2, 5, 288):
+        ring = RingStats(size)
+        window = []
+        for _ in range(3 * size + 50):
+            # repeats stress the ties in the monotonic queues
+            if window and rng.random() < 0.3:
+                value = window[-1]
+            else:
+                value = rng.randrange(-3000, 3000)
+            ring.push(value)
+            window = (window + [value])[-size:]
+            assert len(ring) == len(window)
+            assert ring.min() == min(window)
+            assert ring.max() == max(window)
+            assert ring.mean() == sum(window) / len(window)
+
+
+def test_mean_last():
+    ring = RingStats(4)
+    assert ring.mean_last(3) is None
+    ring.push(10)
+    assert ring.mean_last(3) == 10
+    for value in (20, 30, 40, 50):
+        ring.push(value)
+    # 10 is gone, the newest three are 30, 40, 50
+    assert ring.mean_last(3) == 40
+    assert ring.mean_last(10) == 35
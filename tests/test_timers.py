@@ -0,0 +1,121 @@
+import random
+
+import utils
+from timers import Timers
+
+WRAP = 1 << 29
+
+
+def make(n: int, size: int = 8) -> tuple:
+    timers = Timers(size)
+    fired = []
+    ids = [timers.add(lambda i=i: fired.append(i)) for i in range(n)]
+    return timers, ids, fired
+
+
+def test_fires_in_deadline_order():
+    timers, ids, fired = make(6)
+    for timer, delay in zip(ids, (50, 10, 40, 30, 60, 20)):
+        timers.start(timer, delay, 0)
+    assert timers.next_ms(0) == 10
+    assert timers.run(35) == 3
+    assert fired == [1, 5, 3]
+    assert timers.run(100) == 3
+    assert fired == [1, 5, 3, 2, 0, 4]
+    assert timers.fired == 6
+    assert timers.next_ms(100) == -1
+
+
+def test_cancel_from_the_middle_of_the_heap():
+    timers, ids, fired = make(7)
+    for timer in ids:
+        timers.start(timer, (timer + 1) * 10, 0)
+    timers.cancel(ids[3])
+    timers.cancel(ids[5])
+    timers.cancel(ids[3])  # already idle
+    assert not timers.active(ids[3])
+    assert timers.active(ids[4])
+    timers.run(1000)
+    assert fired == [0, 1, 2, 4, 6]
+
+
+def test_restart_moves_the_deadline():
+    timers, ids, fired = make(2)
+    timers.start(ids[0], 10, 0)
+    timers.start(ids[1], 20, 0)
+    timers.start(ids[0], 30, 0)
+    assert timers.next_ms(0) == 20
+    timers.run(100)
+    assert fired == [1, 0]
+
+
+def test_periodic_timer_does_not_drift():
+    timers, ids, fired = make(1)
+    timers.start(ids[0], 100, 0, period_ms=100)
+    # run late every time, the deadlines stay on the 100 ms grid
+    for now in (130, 250, 390, 410):
+        assert timers.run(now) == 1
+        assert timers.next_ms(now) == 100 - now % 100
+    assert timers.active(ids[0])
+    # a long stall catches up with every missed period
+    assert timers.run(1000) == 6
+
+
+def test_next_ms():
+    timers, ids, _ = make(1)
+    assert timers.next_ms(0) == -1
+    timers.start(ids[0], 500, 1000)
+    assert timers.next_ms(1000) == 500
+    assert timers.next_ms(1400) == 100
+    # overdue is reported as due now
+    assert timers.next_ms(2000) == 0
+
+
+def test_deadlines_across_ticks_wraparound():
+    timers, ids, fired = make(3)
+    now = WRAP - 100
+    timers.start(ids[0], 300, now)  # wraps to 200
+    timers.start(ids[1], 50, now)  # before the wrap
+    timers.start(ids[2], 150, now)  # wraps to 50
+    assert timers.next_ms(now) == 50
+    assert timers.run(WRAP - 1) == 1
+    assert timers.next_ms(WRAP - 1) == 51
+    assert timers.run(100) == 1
+    assert timers.run(199) == 0
+    assert timers.run(200) == 1
+    assert fired == [1, 2, 0]
+
+
+def test_matches_a_sorted_list():
+    rng = random.Random(1)
+    timers, ids, fired = make(8)
+    model = {}  # timer -> deadline
+    now = WRAP - 5000
+    for _ in range(5000):
+        op = rng.random()
+        timer = rng.choice(ids)
+        if op < 0.4:
+            delay = rng.randrange(0, 2000)
+            timers.start(timer, delay, now)
+            model[timer] = utils.ticks_add(now, delay)
+        elif op < 0.6:
+            timers.cancel(timer)
+            model.pop(timer, None)
+        else:
+            now = utils.ticks_add(now, rng.randrange(0, 300))
+            due = [t for t, d in model.items() if utils.ticks_diff(now, d) >= 0]
+            due.sort(key=lambda t: (utils.ticks_diff(model[t], now), ids.index(t)))
+            del fired[:]
+            timers.run(now)
+            # ties may fire in either order
+            assert sorted(fired) == sorted(due)
+            assert [model[t] for t in fired] == [model[t] for t in due]
+            for t in due:
+                del model[t]
+        for timer in ids:
+            assert timers.active(timer) == (timer in model)
+        if model:
+            soonest = min(utils.ticks_diff(d, now) for d in model.values())
+            assert timers.next_ms(now) == max(soonest, 0)
+        else:
+            assert timers.next_ms(now) == -1